@@ -1,44 +1,162 @@
 """Pytest configuration and shared fixtures for jsweb tests."""
 
-import sys
-from io import BytesIO
-from pathlib import Path
+import importlib
+import json
+from dataclasses import dataclass
+from types import MappingProxyType, SimpleNamespace
 
 import pytest
 
-# Add the parent directory to the path so we can import jsweb
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from jsweb.app import JsWebApp
+from jsweb.forms import BooleanField, FileField, Form, IntegerField, StringField
+from jsweb.validators import DataRequired, Email, FileAllowed, FileRequired, FileSize
+
+_JSON_BODY = json.dumps({"key": "value", "number": 42}).encode("utf-8")
+_FORM_BODY = b"username=testuser&email=test@example.com"
+_UPLOAD_BOUNDARY = b"----WebKitFormBoundary"
+_UPLOAD_BODY = b"\r\n".join(
+    [
+        b"--" + _UPLOAD_BOUNDARY,
+        b'Content-Disposition: form-data; name="file"; filename="test.txt"',
+        b"Content-Type: text/plain",
+        b"",
+        b"test file content",
+        b"--" + _UPLOAD_BOUNDARY + b"--",
+        b"",
+    ]
+)
+_UPLOAD_CONTENT_TYPE = "multipart/form-data; boundary=" + _UPLOAD_BOUNDARY.decode()
+
+# WSGI environ values are strings, so the constant lengths are stringified once.
+_JSON_CONTENT_LENGTH = str(len(_JSON_BODY))
+_FORM_CONTENT_LENGTH = str(len(_FORM_BODY))
+_UPLOAD_CONTENT_LENGTH = str(len(_UPLOAD_BODY))
+
+# Request only reads its scope, so every JSON test can share one read-only copy.
+_JSON_SCOPE = MappingProxyType(
+    {
+        "type": "http",
+        "method": "POST",
+        "path": "/",
+        "query_string": b"",
+        "headers": ((b"content-type", b"application/json"),),
+    }
+)
 
 
-@pytest.fixture
+@dataclass(frozen=True)
+class TestConfig:
+    """Immutable settings shared by every test that asks for ``config``."""
+
+    DEBUG: bool = True
+    TESTING: bool = True
+    SECRET_KEY: str = "test-secret-key"
+    DATABASE_URL: str = "sqlite:///:memory:"
+    SQLALCHEMY_ECHO: bool = False
+
+
+_TEST_CONFIG = TestConfig()
+
+
+class _ReadOnlyBytes:
+    """A minimal ``wsgi.input`` stream that reads from ``bytes`` without copying them."""
+
+    def __init__(self, data):
+        self._view = memoryview(data)
+        self._pos = 0
+
+    def read(self, size=-1):
+        """Reads up to ``size`` bytes, or everything that is left."""
+        start = self._pos
+        end = len(self._view) if size is None or size < 0 else start + size
+        self._pos = min(end, len(self._view))
+        return self._view[start : self._pos].tobytes()
+
+    def readline(self, size=-1):
+        """Reads a single line, including its trailing newline."""
+        start = self._pos
+        end = len(self._view)
+        if size is not None and size >= 0:
+            end = min(end, start + size)
+        newline = self._view.obj.find(b"\n", start, end)
+        self._pos = end if newline == -1 else newline + 1
+        return self._view[start : self._pos].tobytes()
+
+    def readlines(self, hint=-1):
+        """Reads the remaining lines into a list."""
+        lines = []
+        total = 0
+        while True:
+            line = self.readline()
+            if not line:
+                break
+            lines.append(line)
+            total += len(line)
+            if hint is not None and 0 < hint <= total:
+                break
+        return lines
+
+    def __iter__(self):
+        return iter(self.readline, b"")
+
+
+class MockField:
+    """Minimal stand-in for a form field, as seen by a validator."""
+
+    __slots__ = ("data",)
+
+    def __init__(self, data=None):
+        self.data = data
+
+
+class MockFile:
+    """Minimal stand-in for an uploaded file, as seen by the file validators."""
+
+    __slots__ = ("filename", "size")
+
+    def __init__(self, filename=None, size=0):
+        self.filename = filename
+        self.size = size
+
+
+@pytest.fixture(scope="session")
 def app():
-    """Create a basic jsweb application for testing."""
-    from jsweb import App
+    """Create a basic jsweb application, shared by every test in the session."""
 
-    app = App(__name__)
-    app.config.TESTING = True
-    return app
+    class AppConfig:
+        TESTING = True
 
+    return JsWebApp(AppConfig())
 
-@pytest.fixture
+
+@pytest.fixture(scope="session")
 def client(app):
     """Create a test client for the app."""
     # This is a simple implementation - you may need to adjust based on your app
     return app
 
 
+@pytest.fixture(scope="session")
+def fake_app():
+    """A minimal stand-in for the application object passed to ``Request``."""
+
+    class FakeApp:
+        class config:
+            pass
+
+    return FakeApp()
+
+
+@pytest.fixture(scope="session")
+def json_scope():
+    """A read-only ASGI scope for a ``POST /`` request with a JSON content type."""
+    return _JSON_SCOPE
+
+
 @pytest.fixture
 def config():
     """Provide a test configuration."""
-
-    class TestConfig:
-        DEBUG = True
-        TESTING = True
-        SECRET_KEY = "test-secret-key"
-        DATABASE_URL = "sqlite:///:memory:"
-        SQLALCHEMY_ECHO = False
-
-    return TestConfig()
+    return _TEST_CONFIG
 
 
 @pytest.fixture
@@ -66,18 +184,23 @@ def fake_environ():
         path="/",
         query_string="",
         content_type="application/x-www-form-urlencoded",
-        content_length=0,
+        content_length="0",
         body=b"",
         cookies="",
     ):
         return {
             "REQUEST_METHOD": method,
             "CONTENT_TYPE": content_type,
-            "CONTENT_LENGTH": str(content_length),
+            "CONTENT_LENGTH": (
+                content_length
+                if isinstance(content_length, str)
+                else str(content_length)
+            ),
             "PATH_INFO": path,
             "QUERY_STRING": query_string,
             "HTTP_COOKIE": cookies,
-            "wsgi.input": BytesIO(body),
+            "wsgi.input": _ReadOnlyBytes(body),
+            "wsgi.input_terminated": True,
             "SERVER_NAME": "testserver",
             "SERVER_PORT": "80",
             "wsgi.url_scheme": "http",
@@ -89,69 +212,247 @@ def fake_environ():
 @pytest.fixture
 def json_request_environ(fake_environ):
     """Create a JSON POST request environ."""
-    import json
-
-    data = {"key": "value", "number": 42}
-    body = json.dumps(data).encode("utf-8")
-
     return fake_environ(
         method="POST",
         path="/api/test",
         content_type="application/json",
-        content_length=len(body),
-        body=body,
+        content_length=_JSON_CONTENT_LENGTH,
+        body=_JSON_BODY,
     )
 
 
 @pytest.fixture
 def form_request_environ(fake_environ):
     """Create a form POST request environ."""
-    body = b"username=testuser&email=test@example.com"
-
     return fake_environ(
         method="POST",
         path="/form",
         content_type="application/x-www-form-urlencoded",
-        content_length=len(body),
-        body=body,
+        content_length=_FORM_CONTENT_LENGTH,
+        body=_FORM_BODY,
     )
 
 
 @pytest.fixture
 def file_upload_environ(fake_environ):
     """Create a file upload request environ."""
-    boundary = "----WebKitFormBoundary"
-    body = (
-        f"--{boundary}\r\n"
-        f'Content-Disposition: form-data; name="file"; filename="test.txt"\r\n'
-        f"Content-Type: text/plain\r\n"
-        f"\r\n"
-        f"test file content\r\n"
-        f"--{boundary}--\r\n"
-    ).encode()
-
     return fake_environ(
         method="POST",
         path="/upload",
-        content_type=f"multipart/form-data; boundary={boundary}",
-        content_length=len(body),
-        body=body,
+        content_type=_UPLOAD_CONTENT_TYPE,
+        content_length=_UPLOAD_CONTENT_LENGTH,
+        body=_UPLOAD_BODY,
     )
 
 
-# Markers configuration
-def pytest_configure(config):
-    """Configure custom pytest markers."""
-    config.addinivalue_line(
-        "markers", "unit: Unit tests that test individual components"
+@pytest.fixture(scope="session")
+def mock_field():
+    """The ``MockField`` class, for building validator inputs."""
+    return MockField
+
+
+@pytest.fixture(scope="session")
+def mock_file():
+    """The ``MockFile`` class, for building file validator inputs."""
+    return MockFile
+
+
+@pytest.fixture(scope="session")
+def simple_string_form():
+    """A form class with two plain string fields."""
+
+    class SimpleStringForm(Form):
+        username = StringField("Username")
+        email = StringField("Email")
+
+    return SimpleStringForm
+
+
+@pytest.fixture(scope="session")
+def login_form():
+    """A form class with required email and password fields."""
+
+    class LoginForm(Form):
+        email = StringField("Email", validators=[DataRequired(), Email()])
+        password = StringField("Password", validators=[DataRequired()])
+
+    return LoginForm
+
+
+@pytest.fixture(scope="session")
+def upload_form():
+    """A form class with a single validated file field."""
+
+    class UploadForm(Form):
+        document = FileField(
+            "Document",
+            validators=[
+                FileRequired(),
+                FileAllowed(["pdf", "doc", "docx"]),
+                FileSize(max_size=5 * 1024 * 1024),  # 5MB
+            ],
+        )
+
+    return UploadForm
+
+
+@pytest.fixture(scope="session")
+def profile_form():
+    """A form class mixing string, integer and boolean fields."""
+
+    class ProfileForm(Form):
+        name = StringField("Name")
+        age = IntegerField("Age")
+        active = BooleanField("Active")
+
+    return ProfileForm
+
+
+def _optional_import(module_name):
+    """Import an optional dependency, returning None when it is not installed."""
+    try:
+        return importlib.import_module(module_name)
+    except ImportError:
+        return None
+
+
+if _optional_import("pytest_benchmark") is None:
+
+    @pytest.fixture
+    def benchmark():
+        """Stand-in for pytest-benchmark's fixture that skips when it is not installed."""
+        pytest.skip("pytest-benchmark not installed")
+
+
+@pytest.fixture(scope="session")
+def optional_deps():
+    """Import optional test dependencies once; missing ones are exposed as None."""
+    return SimpleNamespace(
+        jwt=_optional_import("jwt"),
+        sqlalchemy=_optional_import("sqlalchemy"),
+    )
+
+
+@pytest.fixture(scope="session")
+def jsweb_security():
+    """Import ``jsweb.security`` once, skipping dependent tests if it is unavailable."""
+    return pytest.importorskip("jsweb.security")
+
+
+@pytest.fixture(scope="session")
+def sa_base():
+    """Provide a single SQLAlchemy declarative base shared by the test models."""
+    pytest.importorskip("sqlalchemy")
+    from sqlalchemy.orm import declarative_base
+
+    return declarative_base()
+
+
+@pytest.fixture(scope="session")
+def sa_engine():
+    """Provide an in-memory SQLite engine shared across database tests."""
+    pytest.importorskip("sqlalchemy")
+    from sqlalchemy import create_engine
+
+    engine = create_engine("sqlite:///:memory:")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def sa_sessionmaker(sa_engine):
+    """Provide a session factory bound to the shared in-memory engine."""
+    from sqlalchemy.orm import sessionmaker
+
+    return sessionmaker(bind=sa_engine)
+
+
+@pytest.fixture(scope="session")
+def sa_models(sa_base):
+    """Define the sample ORM models once and return them as a namespace."""
+    import enum
+    from datetime import datetime
+
+    from sqlalchemy import (
+        JSON,
+        Column,
+        DateTime,
+        Enum,
+        ForeignKey,
+        Integer,
+        String,
+        Table,
+        Text,
     )
-    config.addinivalue_line(
-        "markers",
-        "integration: Integration tests that test multiple components together",
+    from sqlalchemy.orm import relationship
+
+    class UserRole(enum.Enum):
+        ADMIN = "admin"
+        USER = "user"
+        GUEST = "guest"
+
+    class IdModel(sa_base):
+        __abstract__ = True
+        id = Column(Integer, primary_key=True)
+
+    user_roles = Table(
+        "user_roles",
+        sa_base.metadata,
+        Column("user_id", Integer, ForeignKey("users.id")),
+        Column("role_id", Integer, ForeignKey("roles.id")),
+    )
+
+    class User(IdModel):
+        __tablename__ = "users"
+        username = Column(String(80), unique=True, nullable=False)
+        email = Column(String(120), unique=True, index=True)
+        password_hash = Column(String(255))
+        phone = Column(String(20), nullable=True)
+        is_active = Column(Integer, default=1)
+        role = Column(Enum(UserRole))
+        extra_data = Column(JSON)
+        roles = relationship("Role", secondary=user_roles)
+
+        def __repr__(self):
+            return f"<User {self.username}>"
+
+    class Role(IdModel):
+        __tablename__ = "roles"
+        name = Column(String(50))
+
+    class Author(IdModel):
+        __tablename__ = "authors"
+        name = Column(String(100))
+
+    class Book(IdModel):
+        __tablename__ = "books"
+        title = Column(String(100))
+        author_id = Column(Integer, ForeignKey("authors.id"))
+        author = relationship("Author")
+
+    class Post(IdModel):
+        __tablename__ = "posts"
+        title = Column(String(100))
+        created_at = Column(DateTime, default=datetime.utcnow)
+
+    class Product(IdModel):
+        __tablename__ = "products"
+        name = Column(String(100), nullable=False)
+        price = Column(Integer)
+
+    class BlogPost(IdModel):
+        __tablename__ = "blog_posts"
+        content = Column(Text)
+
+    return SimpleNamespace(
+        IdModel=IdModel,
+        UserRole=UserRole,
+        user_roles=user_roles,
+        User=User,
+        Role=Role,
+        Author=Author,
+        Book=Book,
+        Post=Post,
+        Product=Product,
+        BlogPost=BlogPost,
     )
-    config.addinivalue_line("markers", "slow: Tests that take a long time to run")
-    config.addinivalue_line("markers", "asyncio: Async tests")
-    config.addinivalue_line("markers", "forms: Form validation tests")
-    config.addinivalue_line("markers", "routing: Routing tests")
-    config.addinivalue_line("markers", "database: Database tests")
-    config.addinivalue_line("markers", "security: Security tests")
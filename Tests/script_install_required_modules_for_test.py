@@ -1,33 +1,50 @@
 import importlib
+import importlib.util
 import os
+import shutil
 import subprocess
 import sys
 
+PIP_CACHE_DIR = os.environ.get(
+    "PIP_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "jsweb-pip")
+)
 
-def install_module(module_name):
-    """Install a Python module using pip."""
 
-    pip = ""
-    if os.name == "nt":
-        pip = "pip"
-    else:
-        pip = "pip3"
+def build_install_command(module_names):
+    """Build the install command, preferring uv's parallel installer over pip."""
+    uv = shutil.which("uv")
+    if uv:
+        return [uv, "pip", "install", "--python", sys.executable, *module_names]
 
+    return [
+        sys.executable,
+        "-m",
+        "pip",
+        "install",
+        "--cache-dir",
+        PIP_CACHE_DIR,
+        "--prefer-binary",
+        "--no-input",
+        *module_names,
+    ]
+
+
+def install_modules(module_names):
+    """Install Python modules using a single installer invocation."""
     try:
-        subprocess.check_call([sys.executable, "-m", pip, "install", module_name])
+        subprocess.check_call(build_install_command(module_names))
         return True
     except subprocess.CalledProcessError as e:
-        print(f"[ERROR] Failed to install module {module_name}: {e}")
+        print(f"[ERROR] Failed to install modules {', '.join(module_names)}: {e}")
 
     return False
 
 
 def check_module_installed(module_name):
-    """Check if a Python module is installed."""
+    """Check if a Python module is installed without importing it."""
     try:
-        importlib.import_module(module_name)
-        return True
-    except ImportError:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
         return False
 
 
@@ -40,21 +57,30 @@ if __name__ == "__main__":
         "django",
     ]
 
-    for module in required_modules:
-        if not check_module_installed(module):
-            print(f"[INFO] Module {module} is not installed. Attempting to install...")
+    missing_modules = [
+        module for module in required_modules if not check_module_installed(module)
+    ]
 
-            if install_module(module):
-                print(f"[INFO] Rechecking installation of module: {module}")
-            else:
-                print(f"[ERROR] Installation attempt for module {module} failed.")
-                continue
+    if missing_modules:
+        print(
+            f"[INFO] Modules {', '.join(missing_modules)} are not installed. "
+            "Attempting to install..."
+        )
+        if not install_modules(missing_modules):
+            print("[ERROR] Installation attempt for missing modules failed.")
+        # find_spec caches directory listings; refresh them to see the new installs.
+        importlib.invalidate_caches()
 
-        if not check_module_installed(module):
+    all_installed = True
+    for module in required_modules:
+        if module in missing_modules and not check_module_installed(module):
             print(
                 f"[ERROR] Module {module} could not be installed. Please install it manually."
             )
+            all_installed = False
+            continue
 
         print(f"[INFO] Module {module} is installed.")
 
-    print("[INFO] All required modules are installed.")
+    if all_installed:
+        print("[INFO] All required modules are installed.")
@@ -1,132 +1,194 @@
 """Tests for JsWeb authentication and user management."""
 
+import hmac
+import time
+from datetime import datetime, timedelta
+
 import pytest
 
 
-@pytest.mark.unit
-def test_user_model():
-    """Test basic user model."""
-    try:
-        from sqlalchemy import Column, Integer, String
-        from sqlalchemy.orm import declarative_base
-
-        Base = declarative_base()
-
-        class User(Base):
-            __tablename__ = "users"
-            id = Column(Integer, primary_key=True)
-            username = Column(String(80), unique=True, nullable=False)
-            email = Column(String(120), unique=True, nullable=False)
-            password_hash = Column(String(255), nullable=False)
-            is_active = Column(Integer, default=1)
-
-        assert User is not None
-        assert hasattr(User, "username")
-        assert hasattr(User, "email")
-        assert hasattr(User, "password_hash")
-    except ImportError:
-        pytest.skip("SQLAlchemy not available")
+class LoginAttempt:
+    __slots__ = ("user_id", "success", "attempts")
 
+    def __init__(self, user_id, success=False):
+        self.user_id = user_id
+        self.success = success
+        self.attempts = 0
 
-@pytest.mark.unit
-def test_user_authentication():
-    """Test user authentication workflow."""
-    try:
-        from jsweb.security import check_password, hash_password
+    def increment(self):
+        self.attempts += 1
 
-        password = "secure_password_123"
-        hashed = hash_password(password)
+    def reset(self):
+        self.attempts = 0
 
-        # Correct password
-        assert check_password(password, hashed)
 
-        # Wrong password
-        assert not check_password("wrong_password", hashed)
-    except ImportError:
-        pytest.skip("Password hashing not available")
+class TwoFactorAuth:
+    __slots__ = ("user_id", "enabled", "secret")
 
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self.enabled = False
+        self.secret = None
 
-@pytest.mark.unit
-def test_session_management():
-    """Test session creation and management."""
-    try:
-        from jsweb.security import generate_session_token
+    def enable(self, secret):
+        self.enabled = True
+        self.secret = secret
 
-        token = generate_session_token()
-        assert token is not None
-        assert len(token) >= 32
-    except ImportError:
-        pytest.skip("Session management not available")
+    def disable(self):
+        self.enabled = False
+        self.secret = None
 
 
-@pytest.mark.unit
-def test_login_attempt_tracking():
-    """Test login attempt tracking."""
+class Permission:
+    __slots__ = ("name", "description")
 
-    # Basic test structure for login attempt tracking
-    class LoginAttempt:
-        def __init__(self, user_id, success=False):
-            self.user_id = user_id
-            self.success = success
-            self.attempts = 0
+    def __init__(self, name, description=""):
+        self.name = name
+        self.description = description
 
-        def increment(self):
-            self.attempts += 1
 
-        def reset(self):
-            self.attempts = 0
+class Role:
+    __slots__ = ("name", "permissions", "_permission_names")
 
-    attempt = LoginAttempt(user_id=1)
-    assert attempt.attempts == 0
+    def __init__(self, name):
+        self.name = name
+        self.permissions = []
+        self._permission_names = set()
 
-    attempt.increment()
-    assert attempt.attempts == 1
+    def add_permission(self, permission):
+        self.permissions.append(permission)
+        self._permission_names.add(permission.name)
 
+    def has_permission(self, permission_name):
+        return permission_name in self._permission_names
 
-@pytest.mark.unit
-def test_password_reset_token():
-    """Test password reset token generation."""
-    try:
-        from jsweb.security import generate_secure_token
 
-        reset_token = generate_secure_token()
-        assert reset_token is not None
-        assert len(reset_token) >= 32
-    except ImportError:
-        pytest.skip("Token generation not available")
+class RoleUser:
+    __slots__ = ("username", "roles")
 
+    def __init__(self, username):
+        self.username = username
+        self.roles = set()
 
-@pytest.mark.unit
-def test_email_verification():
-    """Test email verification token."""
-    try:
-        from jsweb.security import generate_secure_token
+    def add_role(self, role):
+        self.roles.add(role)
+
+    def remove_role(self, role):
+        self.roles.discard(role)
+
+    def has_role(self, role_name):
+        return role_name in self.roles
+
+
+class AuthMiddleware:
+    __slots__ = ("authenticated_users",)
+
+    def __init__(self):
+        self.authenticated_users = {}
+
+    def authenticate(self, username, token):
+        stored = self.authenticated_users.get(username)
+        return stored is not None and hmac.compare_digest(stored, token)
+
+    def login(self, username, token):
+        self.authenticated_users[username] = token
+
+    def logout(self, username):
+        self.authenticated_users.pop(username, None)
+
+
+class Session:
+    __slots__ = ("created_at", "timeout_seconds")
+
+    def __init__(self, timeout_seconds=3600):
+        self.created_at = time.monotonic()
+        self.timeout_seconds = timeout_seconds
+
+    def is_expired(self):
+        return time.monotonic() - self.created_at > self.timeout_seconds
 
-        verification_token = generate_secure_token()
-        assert verification_token is not None
-    except ImportError:
-        pytest.skip("Token generation not available")
+    def remaining_time(self):
+        remaining = self.timeout_seconds - (time.monotonic() - self.created_at)
+        return max(0, remaining)
+
+
+class Account:
+    __slots__ = ("failed_attempts", "max_attempts", "is_locked")
+
+    def __init__(self, max_attempts=5):
+        self.failed_attempts = 0
+        self.max_attempts = max_attempts
+        self.is_locked = False
+
+    def failed_login(self):
+        self.failed_attempts += 1
+        if self.failed_attempts >= self.max_attempts:
+            self.is_locked = True
+
+    def reset_attempts(self):
+        self.failed_attempts = 0
+        self.is_locked = False
+
+
+class SocialAuth:
+    __slots__ = ("provider", "oauth_token")
+
+    def __init__(self, provider):
+        self.provider = provider
+        self.oauth_token = None
+
+    def get_auth_url(self):
+        return f"https://{self.provider}/oauth/authorize"
+
+    def set_token(self, token):
+        self.oauth_token = token
+
+
+class UserProfile:
+    __slots__ = ("user_id", "bio", "avatar_url", "preferences")
+
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self.bio = ""
+        self.avatar_url = None
+        self.preferences = {}
+
+    def update_bio(self, bio):
+        self.bio = bio
+
+    def set_preference(self, key, value):
+        self.preferences[key] = value
+
+    def get_preference(self, key, default=None):
+        return self.preferences.get(key, default)
 
 
 @pytest.mark.unit
-def test_two_factor_authentication_setup():
-    """Test 2FA setup."""
+@pytest.mark.parametrize("hasher", ["hash_password", "generate_password_hash"])
+def test_password_round_trip(jsweb_security, hasher):
+    """Test that check_password verifies hashes from either hashing helper."""
+    password = "secure_password_123"
+    hashed = getattr(jsweb_security, hasher)(password)
 
-    # Basic 2FA structure
-    class TwoFactorAuth:
-        def __init__(self, user_id):
-            self.user_id = user_id
-            self.enabled = False
-            self.secret = None
+    assert hashed != password
+    assert hashed != getattr(jsweb_security, hasher)(password)  # salted
+    assert jsweb_security.check_password(password, hashed)
+    assert not jsweb_security.check_password("wrong_password", hashed)
 
-        def enable(self, secret):
-            self.enabled = True
-            self.secret = secret
 
-        def disable(self):
-            self.enabled = False
-            self.secret = None
+@pytest.mark.unit
+def test_login_attempt_tracking():
+    """Test login attempt tracking."""
+    attempt = LoginAttempt(user_id=1)
+    assert attempt.attempts == 0
 
+    attempt.increment()
+    assert attempt.attempts == 1
+
+
+@pytest.mark.unit
+def test_two_factor_authentication_setup():
+    """Test 2FA setup."""
     mfa = TwoFactorAuth(user_id=1)
     assert not mfa.enabled
 
@@ -138,23 +200,6 @@ def test_two_factor_authentication_setup():
 @pytest.mark.unit
 def test_permission_system():
     """Test permission-based access control."""
-
-    class Permission:
-        def __init__(self, name, description=""):
-            self.name = name
-            self.description = description
-
-    class Role:
-        def __init__(self, name):
-            self.name = name
-            self.permissions = []
-
-        def add_permission(self, permission):
-            self.permissions.append(permission)
-
-        def has_permission(self, permission_name):
-            return any(p.name == permission_name for p in self.permissions)
-
     admin_role = Role("Admin")
     read_perm = Permission("read")
     write_perm = Permission("write")
@@ -173,24 +218,7 @@ def test_permission_system():
 @pytest.mark.unit
 def test_user_roles():
     """Test user role assignment."""
-
-    class User:
-        def __init__(self, username):
-            self.username = username
-            self.roles = []
-
-        def add_role(self, role):
-            if role not in self.roles:
-                self.roles.append(role)
-
-        def remove_role(self, role):
-            if role in self.roles:
-                self.roles.remove(role)
-
-        def has_role(self, role_name):
-            return any(r == role_name for r in self.roles)
-
-    user = User("john_doe")
+    user = RoleUser("john_doe")
     user.add_role("user")
 
     assert user.has_role("user")
@@ -203,23 +231,6 @@ def test_user_roles():
 @pytest.mark.unit
 def test_authentication_middleware():
     """Test authentication middleware basics."""
-
-    class AuthMiddleware:
-        def __init__(self):
-            self.authenticated_users = {}
-
-        def authenticate(self, username, token):
-            if username in self.authenticated_users:
-                return self.authenticated_users[username] == token
-            return False
-
-        def login(self, username, token):
-            self.authenticated_users[username] = token
-
-        def logout(self, username):
-            if username in self.authenticated_users:
-                del self.authenticated_users[username]
-
     middleware = AuthMiddleware()
     assert not middleware.authenticate("user1", "token1")
 
@@ -231,95 +242,38 @@ def test_authentication_middleware():
 
 
 @pytest.mark.unit
-def test_jwt_token_support():
+def test_jwt_token_support(optional_deps):
     """Test JWT token support (if available)."""
-    try:
-        from datetime import datetime, timedelta
-
-        import jwt
+    jwt = optional_deps.jwt
+    if jwt is None:
+        pytest.skip("PyJWT not available")
 
-        secret = "test-secret"
-        payload = {
-            "user_id": 1,
-            "username": "john",
-            "exp": datetime.utcnow() + timedelta(hours=1),
-        }
+    secret = "test-secret"
+    payload = {
+        "user_id": 1,
+        "username": "john",
+        "exp": datetime.utcnow() + timedelta(hours=1),
+    }
 
-        token = jwt.encode(payload, secret, algorithm="HS256")
-        assert token is not None
+    token = jwt.encode(payload, secret, algorithm="HS256")
+    assert token is not None
 
-        decoded = jwt.decode(token, secret, algorithms=["HS256"])
-        assert decoded["user_id"] == 1
-        assert decoded["username"] == "john"
-    except ImportError:
-        pytest.skip("PyJWT not available")
+    decoded = jwt.decode(token, secret, algorithms=["HS256"])
+    assert decoded["user_id"] == 1
+    assert decoded["username"] == "john"
 
 
 @pytest.mark.unit
 def test_session_timeout():
     """Test session timeout functionality."""
-    from datetime import datetime, timedelta
-
-    class Session:
-        def __init__(self, timeout_seconds=3600):
-            self.created_at = datetime.utcnow()
-            self.timeout_seconds = timeout_seconds
-
-        def is_expired(self):
-            elapsed = (datetime.utcnow() - self.created_at).total_seconds()
-            return elapsed > self.timeout_seconds
-
-        def remaining_time(self):
-            elapsed = (datetime.utcnow() - self.created_at).total_seconds()
-            remaining = self.timeout_seconds - elapsed
-            return max(0, remaining)
-
     session = Session(timeout_seconds=3600)
     assert not session.is_expired()
     assert session.remaining_time() > 0
 
 
-@pytest.mark.unit
-def test_password_reset_flow():
-    """Test password reset workflow."""
-    try:
-        from jsweb.security import generate_secure_token, hash_password
-
-        # Step 1: Generate reset token
-        reset_token = generate_secure_token()
-        assert reset_token is not None
-
-        # Step 2: Hash new password
-        new_password = "new_secure_password_123"
-        new_hash = hash_password(new_password)
-        assert new_hash is not None
-
-        # Step 3: Update password (simulated)
-        # password_hash = new_hash
-
-    except ImportError:
-        pytest.skip("Security utilities not available")
-
-
 @pytest.mark.unit
 def test_account_lockout():
     """Test account lockout after failed attempts."""
-
-    class Account:
-        def __init__(self, max_attempts=5):
-            self.failed_attempts = 0
-            self.max_attempts = max_attempts
-            self.is_locked = False
-
-        def failed_login(self):
-            self.failed_attempts += 1
-            if self.failed_attempts >= self.max_attempts:
-                self.is_locked = True
-
-        def reset_attempts(self):
-            self.failed_attempts = 0
-            self.is_locked = False
-
     account = Account(max_attempts=3)
     assert not account.is_locked
 
@@ -334,18 +288,6 @@ def test_account_lockout():
 @pytest.mark.unit
 def test_social_authentication():
     """Test social authentication provider integration."""
-
-    class SocialAuth:
-        def __init__(self, provider):
-            self.provider = provider
-            self.oauth_token = None
-
-        def get_auth_url(self):
-            return f"https://{self.provider}/oauth/authorize"
-
-        def set_token(self, token):
-            self.oauth_token = token
-
     google_auth = SocialAuth("google.com")
     assert google_auth.provider == "google.com"
     assert google_auth.get_auth_url() == "https://google.com/oauth/authorize"
@@ -354,23 +296,6 @@ def test_social_authentication():
 @pytest.mark.unit
 def test_user_profile():
     """Test user profile management."""
-
-    class UserProfile:
-        def __init__(self, user_id):
-            self.user_id = user_id
-            self.bio = ""
-            self.avatar_url = None
-            self.preferences = {}
-
-        def update_bio(self, bio):
-            self.bio = bio
-
-        def set_preference(self, key, value):
-            self.preferences[key] = value
-
-        def get_preference(self, key, default=None):
-            return self.preferences.get(key, default)
-
     profile = UserProfile(user_id=1)
     profile.update_bio("Software developer")
     profile.set_preference("theme", "dark")
@@ -1,7 +1,18 @@
 """Tests for JsWeb database and ORM functionality."""
 
+import enum
+
 import pytest
 
+pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import JSON, Column, Enum, Integer, String, Text  # noqa: E402
+
+
+class _Status(enum.Enum):
+    ACTIVE = "active"
+    DISABLED = "disabled"
+
 
 @pytest.mark.unit
 @pytest.mark.database
@@ -28,335 +39,264 @@ def test_sqlalchemy_import():
 
 @pytest.mark.unit
 @pytest.mark.database
-def test_model_definition():
-    """Test model definition."""
-    try:
-        from sqlalchemy import Column, Integer, String
-        from sqlalchemy.orm import declarative_base
-
-        Base = declarative_base()
-
-        class User(Base):
-            __tablename__ = "users"
-            id = Column(Integer, primary_key=True)
-            username = Column(String(80), unique=True, nullable=False)
-            email = Column(String(120), unique=True, nullable=False)
-
-        assert User is not None
-        assert hasattr(User, "__tablename__")
-    except ImportError:
-        pytest.skip("SQLAlchemy not available")
+@pytest.mark.parametrize(
+    "column_factory,check",
+    [
+        pytest.param(
+            lambda: Column(String(80)),
+            lambda col: isinstance(col.type, String),
+            id="string",
+        ),
+        pytest.param(
+            lambda: Column(String(80), nullable=False),
+            lambda col: col.nullable is False,
+            id="not_nullable",
+        ),
+        pytest.param(
+            lambda: Column(String(20), nullable=True),
+            lambda col: col.nullable is True,
+            id="nullable",
+        ),
+        pytest.param(
+            lambda: Column(String(120), index=True),
+            lambda col: col.index is True,
+            id="indexed",
+        ),
+        pytest.param(
+            lambda: Column(String(80), unique=True),
+            lambda col: col.unique is True,
+            id="unique",
+        ),
+        pytest.param(
+            lambda: Column(Text),
+            lambda col: isinstance(col.type, Text),
+            id="text",
+        ),
+        pytest.param(
+            lambda: Column(JSON),
+            lambda col: isinstance(col.type, JSON),
+            id="json",
+        ),
+        pytest.param(
+            lambda: Column(Enum(_Status)),
+            lambda col: col.type.enum_class is _Status,
+            id="enum",
+        ),
+    ],
+)
+def test_model_column(sa_base, request, column_factory, check):
+    """Test that a mapped model picks up each kind of column configuration."""
+    suffix = request.node.callspec.id
+    model = type(
+        f"ColumnModel_{suffix}",
+        (sa_base,),
+        {
+            "__tablename__": f"column_model_{suffix}",
+            "id": Column(Integer, primary_key=True),
+            "col": column_factory(),
+        },
+    )
+
+    assert hasattr(model, "col")
+    assert check(model.__table__.c.col)
 
 
 @pytest.mark.unit
 @pytest.mark.database
-def test_model_relationships():
+def test_model_relationships(sa_models):
     """Test model relationship definitions."""
-    try:
-        from sqlalchemy import Column, ForeignKey, Integer, String
-        from sqlalchemy.orm import declarative_base, relationship
-
-        Base = declarative_base()
-
-        class Author(Base):
-            __tablename__ = "authors"
-            id = Column(Integer, primary_key=True)
-            name = Column(String(100))
-
-        class Book(Base):
-            __tablename__ = "books"
-            id = Column(Integer, primary_key=True)
-            title = Column(String(100))
-            author_id = Column(Integer, ForeignKey("authors.id"))
-            author = relationship("Author")
-
-        assert Book is not None
-        assert hasattr(Book, "author")
-    except ImportError:
-        pytest.skip("SQLAlchemy relationships not available")
+    assert sa_models.Book is not None
+    assert hasattr(sa_models.Book, "author")
 
 
 @pytest.mark.unit
 @pytest.mark.database
-def test_database_session():
+def test_database_session(sa_sessionmaker):
     """Test database session creation."""
+    session = sa_sessionmaker()
     try:
-        from sqlalchemy import create_engine
-        from sqlalchemy.orm import sessionmaker
-
-        engine = create_engine("sqlite:///:memory:")
-        Session = sessionmaker(bind=engine)
-        session = Session()
-
         assert session is not None
         assert hasattr(session, "query")
-    except ImportError:
-        pytest.skip("SQLAlchemy not available")
+    finally:
+        session.close()
 
 
 @pytest.mark.unit
 @pytest.mark.database
-def test_model_validation():
+def test_model_validation(sa_models):
     """Test model field validation."""
-    try:
-        from sqlalchemy import CheckConstraint, Column, Integer, String
-        from sqlalchemy.orm import declarative_base
-
-        Base = declarative_base()
-
-        class Product(Base):
-            __tablename__ = "products"
-            id = Column(Integer, primary_key=True)
-            name = Column(String(100), nullable=False)
-            price = Column(Integer)
-
-        assert Product is not None
-    except ImportError:
-        pytest.skip("SQLAlchemy not available")
+    assert sa_models.Product is not None
+    assert sa_models.Product.__table__.c.name.nullable is False
 
 
 @pytest.mark.unit
 @pytest.mark.database
 def test_migration_support():
     """Test that Alembic is available for migrations."""
-    try:
-        from alembic import command
-        from alembic.config import Config
+    alembic_command = pytest.importorskip("alembic.command")
+    alembic_config = pytest.importorskip("alembic.config")
 
-        assert command is not None
-        assert Config is not None
-    except ImportError:
-        pytest.skip("Alembic not available")
+    assert alembic_command is not None
+    assert alembic_config.Config is not None
 
 
 @pytest.mark.unit
 @pytest.mark.database
-def test_model_inheritance():
+def test_model_inheritance(sa_models):
     """Test model inheritance."""
-    try:
-        from sqlalchemy import Column, Integer, String
-        from sqlalchemy.orm import declarative_base
-
-        Base = declarative_base()
-
-        class BaseModel(Base):
-            __abstract__ = True
-            id = Column(Integer, primary_key=True)
-
-        class User(BaseModel):
-            __tablename__ = "users"
-            username = Column(String(80))
-
-        assert User is not None
-        assert hasattr(User, "id")
-    except ImportError:
-        pytest.skip("SQLAlchemy not available")
+    assert issubclass(sa_models.User, sa_models.IdModel)
+    assert hasattr(sa_models.User, "id")
 
 
 @pytest.mark.unit
 @pytest.mark.database
-def test_model_indexes():
-    """Test model field indexing."""
-    try:
-        from sqlalchemy import Column, Index, Integer, String
-        from sqlalchemy.orm import declarative_base
-
-        Base = declarative_base()
-
-        class User(Base):
-            __tablename__ = "users"
-            id = Column(Integer, primary_key=True)
-            email = Column(String(120), index=True)
-
-        assert User is not None
-    except ImportError:
-        pytest.skip("SQLAlchemy not available")
+def test_model_default_values(sa_models):
+    """Test model default values."""
+    assert sa_models.Post.__table__.c.created_at.default is not None
 
 
 @pytest.mark.unit
 @pytest.mark.database
-def test_model_constraints():
-    """Test unique constraints."""
-    try:
-        from sqlalchemy import Column, Integer, String, UniqueConstraint
-        from sqlalchemy.orm import declarative_base
-
-        Base = declarative_base()
-
-        class User(Base):
-            __tablename__ = "users"
-            id = Column(Integer, primary_key=True)
-            username = Column(String(80), unique=True)
-            email = Column(String(120), unique=True)
-
-        assert User is not None
-    except ImportError:
-        pytest.skip("SQLAlchemy not available")
+def test_model_repr(sa_models):
+    """Test model string representation."""
+    assert repr(sa_models.User(username="john")) == "<User john>"
 
 
 @pytest.mark.unit
 @pytest.mark.database
-def test_model_default_values():
-    """Test model default values."""
-    try:
-        from datetime import datetime
-
-        from sqlalchemy import Column, DateTime, Integer, String
-        from sqlalchemy.orm import declarative_base
-
-        Base = declarative_base()
-
-        class Post(Base):
-            __tablename__ = "posts"
-            id = Column(Integer, primary_key=True)
-            title = Column(String(100))
-            created_at = Column(DateTime, default=datetime.utcnow)
-
-        assert Post is not None
-    except ImportError:
-        pytest.skip("SQLAlchemy not available")
+def test_many_to_many_relationship(sa_models):
+    """Test many-to-many relationship."""
+    assert sa_models.User is not None
+    assert sa_models.Role is not None
+    assert sa_models.User.roles.property.secondary is sa_models.user_roles
 
 
 @pytest.mark.unit
 @pytest.mark.database
-def test_nullable_fields():
-    """Test nullable field configuration."""
-    try:
-        from sqlalchemy import Column, Integer, String
-        from sqlalchemy.orm import declarative_base
+def test_model_to_dict_caches_columns_per_class():
+    """Test that to_dict reads each model's own columns, caching them per class."""
+    from jsweb.database import ModelBase
 
-        Base = declarative_base()
+    class Tag(ModelBase):
+        __tablename__ = "to_dict_tags"
+        id = Column(Integer, primary_key=True)
+        name = Column(String(50))
 
-        class User(Base):
-            __tablename__ = "users"
-            id = Column(Integer, primary_key=True)
-            username = Column(String(80), nullable=False)
-            phone = Column(String(20), nullable=True)
+    class Note(ModelBase):
+        __tablename__ = "to_dict_notes"
+        id = Column(Integer, primary_key=True)
+        body = Column(Text)
 
-        assert User is not None
-    except ImportError:
-        pytest.skip("SQLAlchemy not available")
+    assert Tag(id=1, name="news").to_dict() == {"id": 1, "name": "news"}
+    assert Note(id=2, body="hi").to_dict() == {"id": 2, "body": "hi"}
+    assert Tag._column_keys == ("id", "name")
+    assert ModelBase._column_keys is None
 
 
 @pytest.mark.unit
 @pytest.mark.database
-def test_model_repr():
-    """Test model string representation."""
+@pytest.mark.parametrize(
+    "url, pool_name",
+    [("sqlite://", "StaticPool"), ("sqlite:///{tmp}/app.db", "QueuePool")],
+)
+def test_init_db_sqlite_pools(tmp_path, monkeypatch, url, pool_name):
+    """Test that in-memory SQLite shares one connection and file SQLite pools."""
+    from jsweb import database
+
+    monkeypatch.setattr(database, "_engine", None)
     try:
-        from sqlalchemy import Column, Integer, String
-        from sqlalchemy.orm import declarative_base
-
-        Base = declarative_base()
-
-        class User(Base):
-            __tablename__ = "users"
-            id = Column(Integer, primary_key=True)
-            username = Column(String(80))
-
-            def __repr__(self):
-                return f"<User {self.username}>"
-
-        assert User is not None
-    except ImportError:
-        pytest.skip("SQLAlchemy not available")
+        database.init_db(url.format(tmp=tmp_path))
+        engine = database.get_engine()
+        assert type(engine.pool).__name__ == pool_name
+        engine.dispose()
+    finally:
+        database.Session.configure(bind=None)
 
 
 @pytest.mark.unit
 @pytest.mark.database
-def test_enum_field():
-    """Test enum field type."""
-    try:
-        import enum
-
-        from sqlalchemy import Column, Enum, Integer, String
-        from sqlalchemy.orm import declarative_base
+def test_init_db_pool_settings(monkeypatch):
+    """Test that client/server databases get the pool settings passed to init_db."""
+    from jsweb import database
 
-        Base = declarative_base()
+    captured = {}
 
-        class UserRole(enum.Enum):
-            ADMIN = "admin"
-            USER = "user"
-            GUEST = "guest"
+    def fake_create_engine(url, **kwargs):
+        captured.update(kwargs, backend=url.get_backend_name())
+        return None
 
-        class User(Base):
-            __tablename__ = "users"
-            id = Column(Integer, primary_key=True)
-            role = Column(Enum(UserRole))
+    monkeypatch.setattr(database, "create_engine", fake_create_engine)
+    monkeypatch.setattr(database, "_engine", None)
+    try:
+        database.init_db("postgresql://db.example/app", pool_size=5)
+    finally:
+        database.Session.configure(bind=None)
 
-        assert User is not None
-    except ImportError:
-        pytest.skip("SQLAlchemy Enum not available")
+    assert captured == {
+        "backend": "postgresql",
+        "echo": False,
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+    }
 
 
 @pytest.mark.unit
 @pytest.mark.database
-def test_json_field():
-    """Test JSON field type."""
-    try:
-        from sqlalchemy import JSON, Column, Integer
-        from sqlalchemy.orm import declarative_base
+@pytest.mark.parametrize("warm, opened", [(0, 0), (3, 3), (50, 20)])
+def test_init_db_warm_connections(monkeypatch, warm, opened):
+    """Test that init_db pre-opens up to pool_size connections when asked to."""
+    from jsweb import database
 
-        Base = declarative_base()
+    class FakeEngine:
+        def __init__(self):
+            self.open = self.peak = 0
 
-        class User(Base):
-            __tablename__ = "users"
-            id = Column(Integer, primary_key=True)
-            extra_data = Column(JSON)
+        def connect(self):
+            engine = self
 
-        assert User is not None
-    except ImportError:
-        pytest.skip("SQLAlchemy JSON type not available")
+            class Connection:
+                def close(self):
+                    engine.open -= 1
 
+            self.open += 1
+            self.peak = max(self.peak, self.open)
+            return Connection()
 
-@pytest.mark.unit
-@pytest.mark.database
-def test_text_field():
-    """Test large text field."""
+    engine = FakeEngine()
+    monkeypatch.setattr(database, "create_engine", lambda url, **kwargs: engine)
+    monkeypatch.setattr(database, "_engine", None)
     try:
-        from sqlalchemy import Column, Integer, Text
-        from sqlalchemy.orm import declarative_base
-
-        Base = declarative_base()
-
-        class BlogPost(Base):
-            __tablename__ = "blog_posts"
-            id = Column(Integer, primary_key=True)
-            content = Column(Text)
+        database.init_db("postgresql://db.example/app", warm_connections=warm)
+    finally:
+        database.Session.configure(bind=None)
 
-        assert BlogPost is not None
-    except ImportError:
-        pytest.skip("SQLAlchemy not available")
+    assert (engine.peak, engine.open) == (opened, 0)
 
 
 @pytest.mark.unit
 @pytest.mark.database
-def test_many_to_many_relationship():
-    """Test many-to-many relationship."""
+def test_model_get_many(monkeypatch):
+    """Test that get_many loads a batch of rows in id order, skipping missing ids."""
+    from jsweb import database
+
+    class Widget(database.ModelBase):
+        __tablename__ = "get_many_widgets"
+        id = Column(Integer, primary_key=True)
+        name = Column(String(20))
+
+    monkeypatch.setattr(database, "_engine", None)
+    database.init_db("sqlite://")
     try:
-        from sqlalchemy import Column, ForeignKey, Integer, String, Table
-        from sqlalchemy.orm import declarative_base, relationship
-
-        Base = declarative_base()
-
-        # Association table
-        user_roles = Table(
-            "user_roles",
-            Base.metadata,
-            Column("user_id", Integer, ForeignKey("users.id")),
-            Column("role_id", Integer, ForeignKey("roles.id")),
-        )
-
-        class User(Base):
-            __tablename__ = "users"
-            id = Column(Integer, primary_key=True)
-            roles = relationship("Role", secondary=user_roles)
-
-        class Role(Base):
-            __tablename__ = "roles"
-            id = Column(Integer, primary_key=True)
-            name = Column(String(50))
-
-        assert User is not None
-        assert Role is not None
-    except ImportError:
-        pytest.skip("SQLAlchemy not available")
+        Widget.__table__.create(database.get_engine())
+        for i, name in enumerate(["a", "b", "c"], start=1):
+            Widget.create(id=i, name=name)
+        database.db_session.commit()
+
+        assert [w.name for w in Widget.get_many([3, 1, 99])] == ["c", "a"]
+        assert Widget.get_many([]) == []
+    finally:
+        database.db_session.remove()
+        database.get_engine().dispose()
+        database.Session.configure(bind=None)
@@ -1,10 +1,26 @@
 """Tests for new JsWeb features (JSON parsing, file uploads, validators)."""
 
-import json
+from contextlib import nullcontext
 from io import BytesIO
 
 import pytest
 
+from jsweb.request import Request
+from jsweb.validators import FileAllowed, FileRequired, FileSize, ValidationError
+
+# Encoded payloads are bytes literals so no test pays for serialization.
+_USER_JSON_BODY = b'{"name": "Alice", "email": "alice@example.com"}'
+_TYPED_JSON_BODY = b'{"count": 42, "active": true, "items": [1, 2, 3]}'
+
+
+def _make_receive(body):
+    """Build an ASGI ``receive`` callable that delivers ``body`` in one message."""
+
+    async def receive():
+        return {"body": body, "more_body": False}
+
+    return receive
+
 
 @pytest.mark.unit
 def test_import_new_features():
@@ -20,30 +36,9 @@ def test_import_new_features():
 
 @pytest.mark.unit
 @pytest.mark.asyncio
-async def test_json_request_parsing():
+async def test_json_request_parsing(fake_app, json_scope):
     """Test JSON request body parsing."""
-    from jsweb.request import Request
-
-    class FakeApp:
-        class config:
-            pass
-
-    body = json.dumps({"name": "Alice", "email": "alice@example.com"})
-    content = body.encode("utf-8")
-
-    app = FakeApp()
-    scope = {
-        "type": "http",
-        "method": "POST",
-        "path": "/",
-        "query_string": b"",
-        "headers": [(b"content-type", b"application/json")],
-    }
-
-    async def receive():
-        return {"body": content, "more_body": False}
-
-    req = Request(scope, receive, app)
+    req = Request(json_scope, _make_receive(_USER_JSON_BODY), fake_app)
     data = await req.json()
 
     assert data == {"name": "Alice", "email": "alice@example.com"}
@@ -53,30 +48,9 @@ async def test_json_request_parsing():
 
 @pytest.mark.unit
 @pytest.mark.asyncio
-async def test_json_parsing_with_numbers():
+async def test_json_parsing_with_numbers(fake_app, json_scope):
     """Test JSON parsing with various data types."""
-    from jsweb.request import Request
-
-    class FakeApp:
-        class config:
-            pass
-
-    body = json.dumps({"count": 42, "active": True, "items": [1, 2, 3]})
-    content = body.encode("utf-8")
-
-    app = FakeApp()
-    scope = {
-        "type": "http",
-        "method": "POST",
-        "path": "/",
-        "query_string": b"",
-        "headers": [(b"content-type", b"application/json")],
-    }
-
-    async def receive():
-        return {"body": content, "more_body": False}
-
-    req = Request(scope, receive, app)
+    req = Request(json_scope, _make_receive(_TYPED_JSON_BODY), fake_app)
     data = await req.json()
 
     assert data["count"] == 42
@@ -85,133 +59,108 @@ async def test_json_parsing_with_numbers():
 
 
 @pytest.mark.unit
-def test_filefield_creation():
-    """Test FileField creation in forms."""
-    from jsweb.forms import FileField, Form
-    from jsweb.validators import FileAllowed, FileRequired, FileSize
-
-    class TestForm(Form):
-        upload = FileField(
-            "Upload File",
-            validators=[
-                FileRequired(),
-                FileAllowed(["jpg", "png"]),
-                FileSize(max_size=1024 * 1024),  # 1MB
-            ],
-        )
-
-    form = TestForm()
-    assert form is not None
-    assert hasattr(form, "upload")
-    assert len(form.upload.validators) == 3
-    validator_names = [v.__class__.__name__ for v in form.upload.validators]
-    assert "FileRequired" in validator_names
-    assert "FileAllowed" in validator_names
-    assert "FileSize" in validator_names
-
-
-@pytest.mark.unit
-def test_fileallowed_validator_accepts_valid_extensions():
-    """Test that FileAllowed validator accepts valid file extensions."""
-    from jsweb.validators import FileAllowed
-
-    class MockFile:
-        def __init__(self, filename):
-            self.filename = filename
-
-    class MockField:
-        def __init__(self, filename):
-            self.data = MockFile(filename)
+@pytest.mark.asyncio
+async def test_json_parsing_chunked_body(fake_app, json_scope):
+    """Test that a body delivered over several receive messages is reassembled."""
+    chunks = [
+        _USER_JSON_BODY[:5],
+        b"",
+        _USER_JSON_BODY[5:20],
+        _USER_JSON_BODY[20:],
+    ]
+    messages = iter(
+        {"body": chunk, "more_body": i < len(chunks) - 1}
+        for i, chunk in enumerate(chunks)
+    )
 
-    validator = FileAllowed(["jpg", "png", "gif"])
+    async def receive():
+        return next(messages)
 
-    # Should not raise for valid extensions
-    field = MockField("test.jpg")
-    validator(None, field)  # Should not raise
+    req = Request(json_scope, receive, fake_app)
 
-    field = MockField("image.png")
-    validator(None, field)  # Should not raise
+    assert await req.body() == _USER_JSON_BODY
+    assert await req.json() == {"name": "Alice", "email": "alice@example.com"}
 
 
 @pytest.mark.unit
-def test_fileallowed_validator_rejects_invalid_extensions():
-    """Test that FileAllowed validator rejects invalid file extensions."""
-    from jsweb.validators import FileAllowed, ValidationError
-
-    class MockFile:
-        def __init__(self, filename):
-            self.filename = filename
-
-    class MockField:
-        def __init__(self, filename):
-            self.data = MockFile(filename)
-
-    validator = FileAllowed(["jpg", "png"])
-    field = MockField("script.exe")
-
-    with pytest.raises(ValidationError):
-        validator(None, field)
+@pytest.mark.asyncio
+async def test_json_parsing_invalid_body_returns_empty_dict(fake_app, json_scope):
+    """Test that a malformed JSON body is reported as an empty payload."""
+    req = Request(json_scope, _make_receive(b'{"name": '), fake_app)
+    assert await req.json() == {}
 
 
 @pytest.mark.unit
-def test_filesize_validator_accepts_small_files():
-    """Test that FileSize validator accepts files within size limit."""
-    from jsweb.validators import FileSize
-
-    class MockFile:
-        def __init__(self, size):
-            self.size = size
-
-    class MockField:
-        def __init__(self, size):
-            self.data = MockFile(size)
-
-    validator = FileSize(max_size=1000)
+@pytest.mark.asyncio
+async def test_json_body_parsed_once(fake_app, json_scope):
+    """Test that repeated json() calls reuse the parsed body, even for null."""
+    calls = 0
 
-    # Should not raise for small files
-    field = MockField(500)
-    validator(None, field)  # Should not raise
+    async def receive():
+        nonlocal calls
+        calls += 1
+        return {"body": b"null", "more_body": False}
 
-    field = MockField(1000)  # Exactly at limit
-    validator(None, field)  # Should not raise
+    req = Request(json_scope, receive, fake_app)
+    assert await req.json() is None
+    assert await req.json() is None
+    assert calls == 1
 
 
 @pytest.mark.unit
-def test_filesize_validator_rejects_large_files():
-    """Test that FileSize validator rejects files exceeding size limit."""
-    from jsweb.validators import FileSize, ValidationError
-
-    class MockFile:
-        def __init__(self, size):
-            self.size = size
-
-    class MockField:
-        def __init__(self, size):
-            self.data = MockFile(size)
-
-    validator = FileSize(max_size=1000)
-    field = MockField(2000)
-
-    with pytest.raises(ValidationError):
-        validator(None, field)
+def test_filefield_creation(upload_form):
+    """Test FileField creation in forms."""
+    form = upload_form()
+    assert form is not None
+    assert hasattr(form, "document")
+    assert len(form.document.validators) == 3
+    validator_names = [v.__class__.__name__ for v in form.document.validators]
+    assert "FileRequired" in validator_names
+    assert "FileAllowed" in validator_names
+    assert "FileSize" in validator_names
 
 
 @pytest.mark.unit
-def test_filerequired_validator():
-    """Test FileRequired validator."""
-    from jsweb.validators import FileRequired, ValidationError
+def test_fileallowed_shares_equal_allowlists():
+    """Test that equal allowlists are normalized into one shared frozenset."""
+    first = FileAllowed(["jpg", "png"])
+    second = FileAllowed([".PNG", "JPG"])
 
-    class MockField:
-        def __init__(self, data):
-            self.data = data
+    assert first._allowed is second._allowed
+    assert first._allowed is not FileAllowed(["gif"])._allowed
 
-    validator = FileRequired()
 
-    # Should raise when no file provided
-    field = MockField(None)
-    with pytest.raises(ValidationError):
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "validator, file_kwargs, raises",
+    [
+        (FileAllowed(["jpg", "png", "gif"]), {"filename": "test.jpg"}, False),
+        (FileAllowed(["jpg", "png", "gif"]), {"filename": "image.png"}, False),
+        (FileAllowed(["jpg", "png"]), {"filename": "script.exe"}, True),
+        (FileAllowed([".PNG"]), {"filename": "photo.png"}, False),
+        (FileAllowed(["png"]), {"filename": "README"}, True),
+        (FileSize(max_size=1000), {"size": 500}, False),
+        (FileSize(max_size=1000), {"size": 1000}, False),  # Exactly at limit
+        (FileSize(max_size=1000), {"size": 2000}, True),
+        (FileRequired(), None, True),
+        (FileRequired(), {"filename": "dummy_file"}, False),
+    ],
+    ids=[
+        "allowed-jpg",
+        "allowed-png",
+        "rejected-exe",
+        "allowed-dotted-uppercase",
+        "rejected-no-extension",
+        "size-small",
+        "size-at-limit",
+        "size-too-large",
+        "required-missing",
+        "required-present",
+    ],
+)
+def test_file_validators(mock_field, mock_file, validator, file_kwargs, raises):
+    """Test the file validators against mock uploads; ``None`` means no file."""
+    field = mock_field(None if file_kwargs is None else mock_file(**file_kwargs))
+
+    with pytest.raises(ValidationError) if raises else nullcontext():
         validator(None, field)
-
-    # Should not raise when file provided
-    field = MockField("dummy_file")
-    validator(None, field)  # Should not raise
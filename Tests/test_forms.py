@@ -1,34 +1,49 @@
 """Tests for JsWeb forms and validation system."""
 
+from contextlib import nullcontext
 from io import BytesIO
 
 import pytest
 
+from jsweb.forms import (
+    BooleanField,
+    FileField,
+    Form,
+    HiddenField,
+    IntegerField,
+    PasswordField,
+    SelectField,
+    StringField,
+    TextAreaField,
+)
+from jsweb.validators import (
+    DataRequired,
+    Email,
+    EqualTo,
+    FileAllowed,
+    FileRequired,
+    FileSize,
+    Length,
+    NumberRange,
+    Regexp,
+    ValidationError,
+)
+
 
 @pytest.mark.unit
 @pytest.mark.forms
-def test_form_creation():
+def test_form_creation(simple_string_form):
     """Test basic form creation."""
-    from jsweb.forms import Form, StringField
-
-    class TestForm(Form):
-        username = StringField("Username")
-
-    form = TestForm()
+    form = simple_string_form()
     assert form is not None
     assert hasattr(form, "username")
 
 
 @pytest.mark.unit
 @pytest.mark.forms
-def test_stringfield_creation():
+def test_stringfield_creation(simple_string_form):
     """Test StringField creation."""
-    from jsweb.forms import Form, StringField
-
-    class TestForm(Form):
-        email = StringField("Email")
-
-    form = TestForm()
+    form = simple_string_form()
     assert form.email is not None
     # Label is an object, not a string
     assert hasattr(form.email, "label") or hasattr(form.email, "name")
@@ -36,31 +51,18 @@ def test_stringfield_creation():
 
 @pytest.mark.unit
 @pytest.mark.forms
-def test_form_with_validators():
+def test_form_with_validators(login_form):
     """Test form with validators."""
-    from jsweb.forms import Form, StringField
-    from jsweb.validators import DataRequired, Email
-
-    class LoginForm(Form):
-        email = StringField("Email", validators=[DataRequired(), Email()])
-        password = StringField("Password", validators=[DataRequired()])
-
-    form = LoginForm()
+    form = login_form()
     assert len(form.email.validators) >= 2
     assert len(form.password.validators) >= 1
 
 
 @pytest.mark.unit
 @pytest.mark.forms
-def test_form_field_population():
+def test_form_field_population(simple_string_form):
     """Test populating form fields with data."""
-    from jsweb.forms import Form, StringField
-
-    class UserForm(Form):
-        username = StringField("Username")
-        email = StringField("Email")
-
-    form = UserForm()
+    form = simple_string_form()
     # Manually set field data after form creation
     form.username.data = "john_doe"
     form.email.data = "john@example.com"
@@ -70,80 +72,60 @@ def test_form_field_population():
 
 @pytest.mark.unit
 @pytest.mark.forms
-def test_datarequired_validator():
-    """Test DataRequired validator."""
-    from jsweb.validators import DataRequired, ValidationError
-
-    validator = DataRequired()
-
-    class MockField:
-        data = None
-
-    field = MockField()
-
-    # Should raise for None/empty data
-    with pytest.raises(ValidationError):
+@pytest.mark.parametrize(
+    "validator, value, raises",
+    [
+        (DataRequired(), None, True),
+        (DataRequired(), "", True),
+        (DataRequired(), "valid data", False),
+        (Email(), "test@example.com", False),
+        (Email(), "not-an-email", True),
+        (Length(min=3, max=10), "hello", False),
+        (Length(min=3, max=10), "ab", True),  # Too short
+        (Length(min=3, max=10), "this is way too long", True),  # Too long
+    ],
+    ids=[
+        "required-none",
+        "required-empty",
+        "required-valid",
+        "email-valid",
+        "email-invalid",
+        "length-valid",
+        "length-too-short",
+        "length-too-long",
+    ],
+)
+def test_field_validators(mock_field, validator, value, raises):
+    """Test the DataRequired, Email and Length validators."""
+    field = mock_field(value)
+
+    with pytest.raises(ValidationError) if raises else nullcontext():
         validator(None, field)
 
-    # Should not raise for valid data
-    field.data = "valid data"
-    validator(None, field)  # Should not raise
-
 
 @pytest.mark.unit
 @pytest.mark.forms
-def test_email_validator():
-    """Test Email validator."""
-    from jsweb.validators import Email, ValidationError
-
-    validator = Email()
-
-    class MockField:
-        def __init__(self, data):
-            self.data = data
-
-    # Valid email
-    field = MockField("test@example.com")
-    validator(None, field)  # Should not raise
-
-    # Invalid email
-    field = MockField("not-an-email")
-    with pytest.raises(ValidationError):
-        validator(None, field)
+@pytest.mark.parametrize(
+    "value, raises",
+    [
+        ("user@exämple.com", False),  # Internationalized domain
+        ("user@-example.com", True),  # Domain label starts with a hyphen
+        ("a..b@example.com", True),  # Consecutive dots in the local part
+    ],
+    ids=["idna-domain", "hyphen-label", "double-dot"],
+)
+def test_email_validator_rfc_checks(mock_field, value, raises):
+    """Test the stricter checks Email applies when email-validator is installed."""
+    pytest.importorskip("email_validator")
+
+    with pytest.raises(ValidationError) if raises else nullcontext():
+        Email()(None, mock_field(value))
 
 
 @pytest.mark.unit
 @pytest.mark.forms
-def test_length_validator():
-    """Test Length validator."""
-    from jsweb.validators import Length, ValidationError
-
-    validator = Length(min=3, max=10)
-
-    class MockField:
-        def __init__(self, data):
-            self.data = data
-
-    # Valid length
-    field = MockField("hello")
-    validator(None, field)  # Should not raise
-
-    # Too short
-    field = MockField("ab")
-    with pytest.raises(ValidationError):
-        validator(None, field)
-
-    # Too long
-    field = MockField("this is way too long")
-    with pytest.raises(ValidationError):
-        validator(None, field)
-
-
-@pytest.mark.unit
-@pytest.mark.forms
-def test_eql_validator():
+def test_eql_validator(mock_field):
     """Test EqualTo validator."""
-    from jsweb.validators import EqualTo, ValidationError
 
     class MockForm:
         def __getitem__(self, key):
@@ -154,32 +136,19 @@ def test_eql_validator():
 
     validator = EqualTo("password")
 
-    class MockField:
-        def __init__(self, data):
-            self.data = data
-
     # Matching passwords
-    field = MockField("mypassword")
-    validator(MockForm(), field)  # Should not raise
+    validator(MockForm(), mock_field("mypassword"))  # Should not raise
 
     # Non-matching passwords
-    field = MockField("different")
     with pytest.raises(ValidationError):
-        validator(MockForm(), field)
+        validator(MockForm(), mock_field("different"))
 
 
 @pytest.mark.unit
 @pytest.mark.forms
-def test_form_multiple_fields():
+def test_form_multiple_fields(profile_form):
     """Test form with multiple different field types."""
-    from jsweb.forms import BooleanField, Form, IntegerField, StringField
-
-    class ProfileForm(Form):
-        name = StringField("Name")
-        age = IntegerField("Age")
-        active = BooleanField("Active")
-
-    form = ProfileForm()
+    form = profile_form()
     # Manually set field data
     form.name.data = "John Doe"
     form.age.data = 30
@@ -193,7 +162,6 @@ def test_form_multiple_fields():
 @pytest.mark.forms
 def test_form_field_rendering():
     """Test form field HTML rendering."""
-    from jsweb.forms import Form, StringField
 
     class ContactForm(Form):
         email = StringField("Email")
@@ -209,7 +177,6 @@ def test_form_field_rendering():
 @pytest.mark.forms
 def test_textarea_field():
     """Test TextAreaField."""
-    from jsweb.forms import Form, TextAreaField
 
     class CommentForm(Form):
         comment = TextAreaField("Comment")
@@ -223,116 +190,79 @@ def test_textarea_field():
 @pytest.mark.forms
 def test_select_field():
     """Test SelectField."""
-    try:
-        from jsweb.forms import Form, SelectField
-
-        class CategoryForm(Form):
-            category = SelectField(
-                "Category",
-                choices=[
-                    ("tech", "Technology"),
-                    ("business", "Business"),
-                    ("sports", "Sports"),
-                ],
-            )
-
-        form = CategoryForm()
-        form.category.data = "tech"
-        assert form.category.data == "tech"
-    except ImportError:
-        pytest.skip("SelectField not available")
+
+    class CategoryForm(Form):
+        category = SelectField(
+            "Category",
+            choices=[
+                ("tech", "Technology"),
+                ("business", "Business"),
+                ("sports", "Sports"),
+            ],
+        )
+
+    form = CategoryForm()
+    form.category.data = "tech"
+    assert form.category.data == "tech"
 
 
 @pytest.mark.unit
 @pytest.mark.forms
-def test_range_validator():
+@pytest.mark.parametrize(
+    "value, raises",
+    [(50, False), (0, True), (101, True), (None, True), ("5", True)],
+    ids=["in-range", "too-small", "too-large", "missing", "non-numeric"],
+)
+def test_range_validator(mock_field, value, raises):
     """Test NumberRange validator."""
-    try:
-        from jsweb.validators import NumberRange, ValidationError
-
-        validator = NumberRange(min=1, max=100)
+    validator = NumberRange(min=1, max=100)
+    field = mock_field(value)
 
-        class MockField:
-            def __init__(self, data):
-                self.data = data
-
-        # Valid range
-        field = MockField(50)
-        validator(None, field)  # Should not raise
+    with pytest.raises(ValidationError) if raises else nullcontext():
+        validator(None, field)
 
-        # Too small
-        field = MockField(0)
-        with pytest.raises(ValidationError):
-            validator(None, field)
 
-        # Too large
-        field = MockField(101)
-        with pytest.raises(ValidationError):
-            validator(None, field)
-    except ImportError:
-        pytest.skip("NumberRange not available")
+@pytest.mark.unit
+@pytest.mark.forms
+def test_range_validator_unbounded_requires_value(mock_field):
+    """Test that a NumberRange without bounds still rejects missing data."""
+    NumberRange()(None, mock_field(0))
+    with pytest.raises(ValidationError, match="Number is required."):
+        NumberRange()(None, mock_field(None))
 
 
 @pytest.mark.unit
 @pytest.mark.forms
-def test_regex_validator():
+@pytest.mark.parametrize(
+    "value, raises",
+    [("username123", False), ("user@name", True)],
+    ids=["alphanumeric", "special-char"],
+)
+def test_regex_validator(mock_field, value, raises):
     """Test Regexp validator."""
-    try:
-        from jsweb.validators import Regexp, ValidationError
+    # Only alphanumeric
+    validator = Regexp(r"^\w+$")
+    field = mock_field(value)
 
-        # Only alphanumeric
-        validator = Regexp(r"^\w+$")
-
-        class MockField:
-            def __init__(self, data):
-                self.data = data
-
-        # Valid
-        field = MockField("username123")
-        validator(None, field)  # Should not raise
-
-        # Invalid (contains special char)
-        field = MockField("user@name")
-        with pytest.raises(ValidationError):
-            validator(None, field)
-    except ImportError:
-        pytest.skip("Regexp validator not available")
+    with pytest.raises(ValidationError) if raises else nullcontext():
+        validator(None, field)
 
 
 @pytest.mark.unit
 @pytest.mark.forms
-def test_form_field_errors():
+def test_form_field_errors(login_form):
     """Test form field error handling."""
-    from jsweb.forms import Form, StringField
-    from jsweb.validators import DataRequired, ValidationError
-
-    class RequiredForm(Form):
-        name = StringField("Name", validators=[DataRequired()])
-
-    form = RequiredForm()
+    form = login_form()
 
     # Field should have validators
-    assert len(form.name.validators) > 0
+    assert len(form.password.validators) > 0
 
 
 @pytest.mark.unit
 @pytest.mark.forms
-def test_file_field_validators():
+def test_file_field_validators(upload_form):
     """Test FileField with validators."""
-    from jsweb.forms import FileField, Form
-    from jsweb.validators import FileAllowed, FileRequired, FileSize
-
-    class UploadForm(Form):
-        document = FileField(
-            "Document",
-            validators=[
-                FileRequired(),
-                FileAllowed(["pdf", "doc", "docx"]),
-                FileSize(max_size=5 * 1024 * 1024),  # 5MB
-            ],
-        )
-
-    form = UploadForm()
+    form = upload_form()
     assert form.document is not None
     assert len(form.document.validators) == 3
 
@@ -341,31 +271,22 @@ def test_file_field_validators():
 @pytest.mark.forms
 def test_hidden_field():
     """Test HiddenField."""
-    try:
-        from jsweb.forms import Form, HiddenField
 
-        class SecureForm(Form):
-            csrf_token = HiddenField()
+    class SecureForm(Form):
+        csrf_token = HiddenField()
 
-        form = SecureForm()
-        form.csrf_token.data = "token123"
-        assert form.csrf_token.data == "token123"
-    except ImportError:
-        pytest.skip("HiddenField not available")
+    form = SecureForm()
+    form.csrf_token.data = "token123"
+    assert form.csrf_token.data == "token123"
 
 
 @pytest.mark.unit
 @pytest.mark.forms
 def test_password_field():
     """Test PasswordField."""
-    try:
-        from jsweb.forms import Form, PasswordField
-        from jsweb.validators import DataRequired
 
-        class LoginForm(Form):
-            password = PasswordField("Password", validators=[DataRequired()])
+    class LoginForm(Form):
+        password = PasswordField("Password", validators=[DataRequired()])
 
-        form = LoginForm()
-        assert form.password is not None
-    except ImportError:
-        pytest.skip("PasswordField not available")
+    form = LoginForm()
+    assert form.password is not None
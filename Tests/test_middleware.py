@@ -1,7 +1,41 @@
 """Tests for JsWeb middleware and request processing."""
 
+import os
+import re
+import time
+from collections import OrderedDict
+
 import pytest
 
+jsweb_middleware = pytest.importorskip("jsweb.middleware")
+
+# Optional middleware that not every build ships.
+CORSMiddleware = jsweb_middleware.__dict__.get("CORSMiddleware")
+GZipMiddleware = jsweb_middleware.__dict__.get("GZipMiddleware")
+
+
+# Authorization scheme prefix checked by the test AuthMiddleware.
+_BEARER = "Bearer "
+
+
+def _noop_start_response(status, headers):
+    """A WSGI ``start_response`` for tests that don't inspect the response."""
+    return None
+
+
+class _StartResponseCapture:
+    """A WSGI ``start_response`` that records the status and headers it receives."""
+
+    __slots__ = ("status", "headers")
+
+    def __init__(self):
+        self.status = None
+        self.headers = ()
+
+    def __call__(self, status, headers):
+        self.status = status
+        self.headers = headers
+
 
 @pytest.mark.unit
 def test_middleware_basic():
@@ -45,46 +79,279 @@ def test_middleware_chain():
     m2 = Middleware(m1, "second")
 
     environ = {}
-    m2(environ, lambda s, h: None)
+    m2(environ, _noop_start_response)
 
     assert m1.executed
     assert m2.executed
 
 
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_app_middleware_chain_built_once():
+    """Test that JsWebApp reuses its middleware chain until a blueprint changes it."""
+    from jsweb.app import JsWebApp
+    from jsweb.blueprints import Blueprint
+    from jsweb.response import JSONResponse
+
+    class AppConfig:
+        TESTING = True
+
+    app = JsWebApp(AppConfig())
+
+    @app.route("/ping")
+    def ping(req):
+        return JSONResponse({"ok": True})
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def request():
+        messages = []
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {"type": "http", "method": "GET", "path": "/ping", "headers": []}
+        await app(scope, receive, send)
+        return messages[0]["status"]
+
+    assert await request() == 200
+    chain = app._asgi_chain
+    assert await request() == 200
+    assert app._asgi_chain is chain
+
+    app.register_blueprint(Blueprint("assets", static_folder="assets"))
+    assert app._asgi_chain is None
+    assert await request() == 200
+    assert app._asgi_chain is not chain
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_app_serves_static_before_csrf_and_db(tmp_path, monkeypatch):
+    """Test that static files are served without the CSRF check or a DB session."""
+    import jsweb.database
+    from jsweb.app import JsWebApp
+
+    class NoSession:
+        def __getattr__(self, name):
+            raise AssertionError("static requests must not use the DB session")
+
+    monkeypatch.setattr(jsweb.database, "db_session", NoSession())
+    (tmp_path / "site.css").write_text("body {}")
+
+    class AppConfig:
+        TESTING = True
+        STATIC_URL = "/static"
+        STATIC_DIR = str(tmp_path)
+
+    app = JsWebApp(AppConfig())
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": "/static/site.css", "headers": []}
+    await app(scope, receive, send)
+
+    assert messages[0]["status"] == 200
+    assert messages[1]["body"] == b"body {}"
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "path, status, content_type",
+    [
+        ("/static/site.css", 200, "text/css"),
+        ("/static/LOGO.PNG", 200, "image/png"),
+        ("/static/missing.css", 404, "text/html"),
+        ("/staticfoo/site.css", 404, "text/html"),
+        ("/static/../static-private/key.txt", 403, "text/html"),
+        ("/static/../../etc/passwd", 403, None),
+    ],
+)
+def test_serve_static(tmp_path, path, status, content_type):
+    """Test static file lookup, content types and the directory traversal guard."""
+    from jsweb.static import serve_static
+
+    static_dir = tmp_path / "static"
+    static_dir.mkdir()
+    (static_dir / "site.css").write_text("body {}")
+    (static_dir / "LOGO.PNG").write_bytes(b"\x89PNG")
+    (tmp_path / "static-private").mkdir()
+    (tmp_path / "static-private" / "key.txt").write_text("secret")
+
+    response = serve_static(path, "/static", str(static_dir))
+    assert response.status_code == status
+    if content_type:
+        assert response.headers["content-type"] == content_type
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_static_middleware_resolves_dir_once(tmp_path, monkeypatch):
+    """Test that a relative STATIC_DIR is fixed when the middleware is built."""
+    from jsweb.middleware import StaticFilesMiddleware
+    from jsweb.request import Request
+
+    (tmp_path / "static").mkdir()
+    (tmp_path / "static" / "site.css").write_text("body {}")
+    monkeypatch.chdir(tmp_path)
+
+    async def app(scope, receive, send):
+        raise AssertionError("static requests must not reach the app")
+
+    middleware = StaticFilesMiddleware(app, "/static", "static")
+    monkeypatch.chdir(tmp_path.parent)
+
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": "/static/site.css", "headers": []}
+    scope["jsweb.request"] = Request(scope, None, None)
+    await middleware(scope, None, send)
+
+    assert messages[0]["status"] == 200
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "if_none_match, status",
+    [
+        (None, 200),
+        ('W/"stale"', 200),
+        ("{etag}", 304),
+        ('W/"stale", {etag}', 304),
+        ("*", 304),
+    ],
+)
+async def test_serve_static_conditional(tmp_path, if_none_match, status):
+    """Test that a matching If-None-Match is answered with 304 and the same ETag."""
+    from jsweb.static import serve_static
+
+    (tmp_path / "app.js").write_text("console.log(1);")
+    etag = serve_static("/static/app.js", "/static", str(tmp_path)).headers["etag"]
+    if if_none_match:
+        if_none_match = if_none_match.format(etag=etag)
+
+    response = serve_static("/static/app.js", "/static", str(tmp_path), if_none_match)
+    assert response.status_code == status
+    assert response.headers["etag"] == etag
+    assert response.headers["cache-control"] == "no-cache"
+
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    await response({"type": "http"}, None, send)
+    sent = {k.decode() for k, _ in messages[0]["headers"]}
+    if status == 304:
+        # A 304 must not tell caches the asset is now 0 bytes.
+        assert sent == {"etag", "cache-control"}
+    else:
+        assert "content-length" in sent
+
+
+@pytest.mark.unit
+def test_app_template_paths_resolved_once(tmp_path):
+    """Test that template folders are resolved once per BASE_DIR/TEMPLATE_FOLDER."""
+    from jsweb.app import _LIB_TEMPLATE_PATH, JsWebApp, _resolve_template_paths
+
+    (tmp_path / "templates").mkdir()
+
+    class AppConfig:
+        TESTING = True
+        BASE_DIR = str(tmp_path)
+        TEMPLATE_FOLDER = "templates"
+
+    hits = _resolve_template_paths.cache_info().hits
+    JsWebApp(AppConfig())
+    JsWebApp(AppConfig())
+
+    assert _resolve_template_paths.cache_info().hits == hits + 1
+    assert _resolve_template_paths(str(tmp_path), "templates") == (
+        str(tmp_path / "templates"),
+        _LIB_TEMPLATE_PATH,
+    )
+    assert _resolve_template_paths(str(tmp_path), "missing") == (_LIB_TEMPLATE_PATH,)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "path, cookies, expect_cookie",
+    [
+        ("/api", b"", False),
+        ("/page", b"", True),
+        ("/form-token", b"", True),
+        ("/page", b"csrf_token=existing", False),
+    ],
+)
+async def test_csrf_token_minted_only_when_needed(path, cookies, expect_cookie):
+    """Test that a CSRF cookie is only issued for HTML pages or when a handler uses it."""
+    from jsweb.app import JsWebApp
+    from jsweb.response import HTMLResponse, JSONResponse
+
+    class AppConfig:
+        TESTING = True
+
+    app = JsWebApp(AppConfig())
+    app.route("/api", endpoint="api")(lambda req: JSONResponse({"ok": True}))
+    app.route("/page", endpoint="page")(lambda req: HTMLResponse("<p>page</p>"))
+    app.route("/form-token", endpoint="form_token")(
+        lambda req: JSONResponse({"token": req.csrf_token})
+    )
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "headers": [(b"cookie", cookies)] if cookies else [],
+    }
+    await app(scope, receive, send)
+
+    set_cookies = [v for k, v in messages[0]["headers"] if k == b"set-cookie"]
+    assert any(v.startswith(b"csrf_token=") for v in set_cookies) is expect_cookie
+    for value in set_cookies:
+        assert value.endswith(b"; Path=/; SameSite=Strict")
+        if value.startswith(b"csrf_token="):
+            # 32 random bytes, unpadded urlsafe base64
+            assert re.fullmatch(rb"csrf_token=[\w-]{43};.*", value)
+
+
 @pytest.mark.unit
 def test_cors_middleware():
     """Test CORS middleware."""
-    try:
-        from jsweb.middleware import CORSMiddleware
-
-        cors = CORSMiddleware(allow_origins=["*"])
-        assert cors is not None
-    except ImportError:
-        # Basic CORS implementation test
-        class CORSMiddleware:
-            def __init__(self, allow_origins=None):
-                self.allow_origins = allow_origins or []
+    if CORSMiddleware is None:
+        pytest.skip("CORSMiddleware not available")
 
-        cors = CORSMiddleware(allow_origins=["*"])
-        assert cors is not None
+    cors = CORSMiddleware(allow_origins=["*"])
+    assert cors is not None
 
 
 @pytest.mark.unit
 def test_gzip_middleware():
     """Test GZIP compression middleware."""
-    try:
-        from jsweb.middleware import GZipMiddleware
+    if GZipMiddleware is None:
+        pytest.skip("GZipMiddleware not available")
 
-        gzip = GZipMiddleware()
-        assert gzip is not None
-    except ImportError:
-        # Basic GZIP middleware test
-        class GZipMiddleware:
-            def __init__(self, min_size=500):
-                self.min_size = min_size
-
-        gzip = GZipMiddleware()
-        assert gzip.min_size == 500
+    gzip = GZipMiddleware()
+    assert gzip is not None
 
 
 @pytest.mark.unit
@@ -111,7 +378,7 @@ def test_request_logging_middleware():
     middleware = RequestLoggingMiddleware(dummy_app)
 
     environ = {"REQUEST_METHOD": "GET", "PATH_INFO": "/test"}
-    middleware(environ, lambda s, h: None)
+    middleware(environ, _noop_start_response)
 
     assert len(middleware.requests) == 1
     assert middleware.requests[0]["method"] == "GET"
@@ -127,8 +394,10 @@ def test_authentication_middleware():
             self.app = app
 
         def __call__(self, environ, start_response):
-            auth_header = environ.get("HTTP_AUTHORIZATION", "")
-            if not auth_header.startswith("Bearer "):
+            # No "" default: a missing header is one `is None` test, then a
+            # bounded slice compare against the shared scheme prefix.
+            auth_header = environ.get("HTTP_AUTHORIZATION")
+            if auth_header is None or auth_header[:7] != _BEARER:
                 start_response("401 Unauthorized", [])
                 return [b"Unauthorized"]
 
@@ -142,12 +411,16 @@ def test_authentication_middleware():
 
     # Without auth header
     environ = {}
-    result = middleware(environ, lambda s, h: None)
+    result = middleware(environ, _noop_start_response)
     assert result == [b"Unauthorized"]
 
+    # With another scheme
+    environ = {"HTTP_AUTHORIZATION": "Basic dXNlcjpwYXNz"}
+    assert middleware(environ, _noop_start_response) == [b"Unauthorized"]
+
     # With auth header
     environ = {"HTTP_AUTHORIZATION": "Bearer token123"}
-    result = middleware(environ, lambda s, h: None)
+    result = middleware(environ, _noop_start_response)
     assert environ["user_authenticated"] is True
 
 
@@ -156,27 +429,60 @@ def test_security_headers_middleware():
     """Test security headers middleware."""
 
     class SecurityHeadersMiddleware:
+        _SECURITY_HEADERS = (
+            ("X-Content-Type-Options", "nosniff"),
+            ("X-Frame-Options", "DENY"),
+            ("X-XSS-Protection", "1; mode=block"),
+        )
+
         def __init__(self, app):
             self.app = app
 
         def __call__(self, environ, start_response):
             def custom_start_response(status, headers):
                 # Add security headers
-                security_headers = [
-                    ("X-Content-Type-Options", "nosniff"),
-                    ("X-Frame-Options", "DENY"),
-                    ("X-XSS-Protection", "1; mode=block"),
-                ]
-                headers.extend(security_headers)
+                headers.extend(self._SECURITY_HEADERS)
                 return start_response(status, headers)
 
             return self.app(environ, custom_start_response)
 
     def dummy_app(environ, start_response):
+        start_response("200 OK", [])
         return []
 
+    capture = _StartResponseCapture()
     middleware = SecurityHeadersMiddleware(dummy_app)
-    assert middleware is not None
+    middleware({}, capture)
+    assert capture.status == "200 OK"
+    assert ("X-Frame-Options", "DENY") in capture.headers
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_jsweb_security_headers_middleware_keeps_existing_headers():
+    """Test that jsweb's SecurityHeadersMiddleware never overrides app headers."""
+
+    async def app(scope, receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"X-Frame-Options", b"SAMEORIGIN")],
+            }
+        )
+
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    middleware = jsweb_middleware.SecurityHeadersMiddleware(app)
+    await middleware({"type": "http"}, None, send)
+
+    headers = messages[0]["headers"]
+    assert (b"X-Frame-Options", b"SAMEORIGIN") in headers
+    assert (b"x-frame-options", b"DENY") not in headers
+    assert (b"x-content-type-options", b"nosniff") in headers
 
 
 @pytest.mark.unit
@@ -201,7 +507,7 @@ def test_error_handling_middleware():
 
     middleware = ErrorHandlerMiddleware(failing_app)
 
-    result = middleware({}, lambda s, h: None)
+    result = middleware({}, _noop_start_response)
     assert b"Test error" in result[0]
 
 
@@ -216,7 +522,8 @@ def test_session_middleware():
 
         def __call__(self, environ, start_response):
             # Get or create session
-            session_id = environ.get("HTTP_COOKIE", "").split("session=")[-1]
+            _, sep, session_id = environ.get("HTTP_COOKIE", "").rpartition("session=")
+            session_id = session_id.split(";", 1)[0].strip() if sep else ""
             if not session_id or session_id not in self.sessions:
                 session_id = "new_session_123"
                 self.sessions[session_id] = {}
@@ -232,23 +539,37 @@ def test_session_middleware():
     middleware = SessionMiddleware(dummy_app)
 
     environ = {}
-    middleware(environ, lambda s, h: None)
+    middleware(environ, _noop_start_response)
 
     assert "session" in environ
     assert "session_id" in environ
 
+    # An existing session is found even when other cookies follow it
+    environ = {"HTTP_COOKIE": "session=new_session_123; theme=dark"}
+    middleware(environ, _noop_start_response)
+    assert environ["session_id"] == "new_session_123"
+
 
 @pytest.mark.unit
 def test_content_type_middleware():
     """Test content type handling middleware."""
 
     class ContentTypeMiddleware:
+        JSON_CONTENT_TYPES = frozenset(
+            {
+                "application/json",
+                "application/problem+json",
+                "application/vnd.api+json",
+            }
+        )
+
         def __init__(self, app):
             self.app = app
 
         def __call__(self, environ, start_response):
-            content_type = environ.get("CONTENT_TYPE", "")
-            if "application/json" in content_type:
+            # Compare the bare media type, without parameters such as charset.
+            media_type = environ.get("CONTENT_TYPE", "").partition(";")[0]
+            if media_type.strip().lower() in self.JSON_CONTENT_TYPES:
                 environ["is_json"] = True
 
             return self.app(environ, start_response)
@@ -259,60 +580,100 @@ def test_content_type_middleware():
     middleware = ContentTypeMiddleware(dummy_app)
 
     environ = {"CONTENT_TYPE": "application/json"}
-    middleware(environ, lambda s, h: None)
+    middleware(environ, _noop_start_response)
+
+    assert environ.get("is_json") is True
 
+    environ = {"CONTENT_TYPE": "Application/Problem+JSON; charset=utf-8"}
+    middleware(environ, _noop_start_response)
     assert environ.get("is_json") is True
 
+    environ = {"CONTENT_TYPE": "text/plain; note=application/json"}
+    middleware(environ, _noop_start_response)
+    assert "is_json" not in environ
+
 
 @pytest.mark.unit
 def test_rate_limiting_middleware():
     """Test rate limiting middleware."""
+    window_ns = 60 * 1_000_000_000
 
     class RateLimitMiddleware:
-        def __init__(self, app, requests_per_minute=60):
+        def __init__(
+            self,
+            app,
+            requests_per_minute=60,
+            max_clients=100_000,
+            clock=time.monotonic_ns,
+        ):
             self.app = app
             self.requests_per_minute = requests_per_minute
-            self.request_counts = {}
+            self.max_clients = max_clients
+            self.clock = clock
+            # client ip -> [window start (ns), request count], least recent first
+            self._buckets = OrderedDict()
 
         def __call__(self, environ, start_response):
             client_ip = environ.get("REMOTE_ADDR", "unknown")
-            current_count = self.request_counts.get(client_ip, 0)
-
-            if current_count >= self.requests_per_minute:
+            now = self.clock()
+
+            bucket = self._buckets.get(client_ip)
+            if bucket is None:
+                bucket = self._buckets[client_ip] = [now, 0]
+                if len(self._buckets) > self.max_clients:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(client_ip)
+                if now - bucket[0] >= window_ns:
+                    bucket[0], bucket[1] = now, 0
+
+            if bucket[1] >= self.requests_per_minute:
                 start_response("429 Too Many Requests", [])
                 return [b"Rate limit exceeded"]
 
-            self.request_counts[client_ip] = current_count + 1
+            bucket[1] += 1
             return self.app(environ, start_response)
 
     def dummy_app(environ, start_response):
         return [b"OK"]
 
-    middleware = RateLimitMiddleware(dummy_app, requests_per_minute=3)
+    now = [0]
+    middleware = RateLimitMiddleware(
+        dummy_app, requests_per_minute=3, max_clients=2, clock=lambda: now[0]
+    )
 
     environ = {"REMOTE_ADDR": "192.168.1.1"}
 
     # First 3 requests should succeed
     for i in range(3):
-        result = middleware(environ, lambda s, h: None)
+        result = middleware(environ, _noop_start_response)
         assert result == [b"OK"]
 
     # 4th request should be rate limited
-    result = middleware(environ, lambda s, h: None)
+    result = middleware(environ, _noop_start_response)
     assert result == [b"Rate limit exceeded"]
 
+    # A new window starts once a minute has passed
+    now[0] += window_ns
+    result = middleware(environ, _noop_start_response)
+    assert result == [b"OK"]
+
+    # The least recently seen client is evicted once the cap is exceeded
+    middleware({"REMOTE_ADDR": "10.0.0.1"}, _noop_start_response)
+    middleware({"REMOTE_ADDR": "10.0.0.2"}, _noop_start_response)
+    assert list(middleware._buckets) == ["10.0.0.1", "10.0.0.2"]
+
 
 @pytest.mark.unit
 def test_request_id_middleware():
     """Test request ID tracking middleware."""
-    import uuid
 
     class RequestIDMiddleware:
         def __init__(self, app):
             self.app = app
 
         def __call__(self, environ, start_response):
-            request_id = str(uuid.uuid4())
+            request_id = os.urandom(16).hex()
             environ["request_id"] = request_id
 
             def custom_start_response(status, headers):
@@ -327,10 +688,11 @@ def test_request_id_middleware():
     middleware = RequestIDMiddleware(dummy_app)
 
     environ = {}
-    middleware(environ, lambda s, h: None)
+    middleware(environ, _noop_start_response)
 
     assert "request_id" in environ
     assert isinstance(environ["request_id"], str)
+    assert len(environ["request_id"]) == 32
 
 
 @pytest.mark.unit
@@ -356,5 +718,5 @@ def test_method_override_middleware():
 
     environ = {"REQUEST_METHOD": "POST", "HTTP_X_HTTP_METHOD_OVERRIDE": "DELETE"}
 
-    middleware(environ, lambda s, h: None)
+    middleware(environ, _noop_start_response)
     assert environ["REQUEST_METHOD"] == "DELETE"
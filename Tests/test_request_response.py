@@ -5,93 +5,64 @@ from io import BytesIO
 
 import pytest
 
+# Encoded payloads are bytes literals so no test pays for serialization.
+_KEY_VALUE_JSON_BODY = b'{"key": "value", "number": 42}'
+_NESTED_JSON_BODY = b'{"user": {"name": "John", "address": {"city": "NYC"}}}'
+
 
 @pytest.mark.unit
-def test_request_creation():
+def test_request_creation(fake_app):
     """Test basic request creation."""
     from jsweb.request import Request
 
-    class FakeApp:
-        class config:
-            pass
-
-    app = FakeApp()
     # Request takes (scope, receive, app)
     scope = {"method": "GET", "path": "/test", "query_string": b"", "headers": []}
     receive = lambda: {"body": b"", "more_body": False}
 
-    request = Request(scope, receive, app)
+    request = Request(scope, receive, fake_app)
     assert request is not None
     assert request.method == "GET"
     assert request.path == "/test"
 
 
 @pytest.mark.unit
-def test_request_method():
+def test_request_method(fake_app):
     """Test request method property."""
     from jsweb.request import Request
 
-    class FakeApp:
-        class config:
-            pass
-
-    app = FakeApp()
     receive = lambda: {"body": b"", "more_body": False}
 
     for method in ["GET", "POST", "PUT", "DELETE", "PATCH"]:
         scope = {"method": method, "path": "/", "query_string": b"", "headers": []}
-        request = Request(scope, receive, app)
+        request = Request(scope, receive, fake_app)
         assert request.method == method
 
 
 @pytest.mark.unit
-def test_request_path():
+def test_request_path(fake_app):
     """Test request path property."""
     from jsweb.request import Request
 
-    class FakeApp:
-        class config:
-            pass
-
-    app = FakeApp()
     receive = lambda: {"body": b"", "more_body": False}
 
     test_paths = ["/home", "/users/123", "/api/v1/data"]
 
     for path in test_paths:
         scope = {"method": "GET", "path": path, "query_string": b"", "headers": []}
-        request = Request(scope, receive, app)
+        request = Request(scope, receive, fake_app)
         assert request.path == path
 
 
 @pytest.mark.unit
 @pytest.mark.asyncio
-async def test_request_json_parsing():
+async def test_request_json_parsing(fake_app, json_scope):
     """Test JSON request body parsing."""
-    import json
-
     from jsweb.request import Request
 
-    class FakeApp:
-        class config:
-            pass
-
-    body = json.dumps({"key": "value", "number": 42})
-    content = body.encode("utf-8")
-
-    app = FakeApp()
-    scope = {
-        "type": "http",
-        "method": "POST",
-        "path": "/",
-        "query_string": b"",
-        "headers": [(b"content-type", b"application/json")],
-    }
-
     async def receive():
-        return {"body": content, "more_body": False}
+        return {"body": _KEY_VALUE_JSON_BODY, "more_body": False}
 
-    request = Request(scope, receive, app)
+    request = Request(json_scope, receive, fake_app)
     data = await request.json()
 
     assert data is not None
@@ -101,15 +72,10 @@ async def test_request_json_parsing():
 
 @pytest.mark.unit
 @pytest.mark.asyncio
-async def test_request_form_parsing():
+async def test_request_form_parsing(fake_app):
     """Test form data parsing."""
     from jsweb.request import Request
 
-    class FakeApp:
-        class config:
-            pass
-
-    app = FakeApp()
     scope = {
         "type": "http",
         "method": "POST",
@@ -121,7 +87,7 @@ async def test_request_form_parsing():
     async def receive():
         return {"body": b"username=testuser&password=pass123", "more_body": False}
 
-    request = Request(scope, receive, app)
+    request = Request(scope, receive, fake_app)
     form = await request.form()
 
     assert form is not None
@@ -130,36 +96,71 @@ async def test_request_form_parsing():
 
 
 @pytest.mark.unit
-def test_request_query_string(fake_environ):
+def test_request_query_string(fake_environ, fake_app):
     """Test query string parsing."""
     from jsweb.request import Request
 
-    class FakeApp:
-        class config:
-            pass
-
-    app = FakeApp()
     scope = fake_environ(query_string="name=john&age=30")
     receive = lambda: {"body": b"", "more_body": False}
-    request = Request(scope, receive, app)
+    request = Request(scope, receive, fake_app)
     args = request.query_params if hasattr(request, "query_params") else {}
 
     assert args is not None
 
 
 @pytest.mark.unit
-def test_request_headers(fake_environ):
-    """Test request headers access."""
+def test_request_query_parsed_lazily(fake_app):
+    """Test that the query string is parsed on first access, keeping first values."""
+    from jsweb.request import Request
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/search",
+        "query_string": b"q=caf%C3%A9&page=2&page=3&empty=",
+        "headers": [],
+    }
+    request = Request(scope, None, fake_app)
+
+    assert request._query is None
+    assert request.query == {"q": "caf\u00e9", "page": "2"}
+    assert request.query_params is request.query
+
+
+@pytest.mark.unit
+def test_request_user_loaded_lazily():
+    """Test that the user is loaded through the app only when first accessed."""
+    from types import SimpleNamespace
+
     from jsweb.request import Request
 
-    class FakeApp:
-        class config:
-            pass
+    calls = []
+
+    def load_user(req):
+        calls.append(req)
+        return "alice"
+
+    app = SimpleNamespace(_load_request_user=load_user)
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": []}
+    request = Request(scope, None, app)
+
+    assert calls == []
+    assert request.user == "alice"
+    assert request.user == "alice"
+    assert calls == [request]
+
+    request.user = None
+    assert request.user is None
+
+
+@pytest.mark.unit
+def test_request_headers(fake_environ, fake_app):
+    """Test request headers access."""
+    from jsweb.request import Request
 
-    app = FakeApp()
     scope = fake_environ()
     receive = lambda: {"body": b"", "more_body": False}
-    request = Request(scope, receive, app)
+    request = Request(scope, receive, fake_app)
 
     # Should be able to access headers
     assert request is not None
@@ -167,45 +168,135 @@ def test_request_headers(fake_environ):
 
 
 @pytest.mark.unit
-def test_request_content_type(fake_environ):
+def test_request_content_type(fake_environ, fake_app):
     """Test content type detection."""
     from jsweb.request import Request
 
-    class FakeApp:
-        class config:
-            pass
-
-    app = FakeApp()
-
     # JSON content type
     scope = fake_environ(content_type="application/json")
     receive = lambda: {"body": b"", "more_body": False}
-    request = Request(scope, receive, app)
+    request = Request(scope, receive, fake_app)
     assert request is not None
 
     # Form content type
     scope2 = fake_environ(content_type="application/x-www-form-urlencoded")
-    request = Request(scope2, receive, app)
+    request = Request(scope2, receive, fake_app)
     assert request is not None
 
 
 @pytest.mark.unit
-def test_request_cookies(fake_environ):
+def test_request_cookies(fake_environ, fake_app):
     """Test cookie handling."""
     from jsweb.request import Request
 
-    class FakeApp:
-        class config:
-            pass
-
-    app = FakeApp()
     scope = fake_environ(cookies="session=abc123; user=john")
     receive = lambda: {"body": b"", "more_body": False}
-    request = Request(scope, receive, app)
+    request = Request(scope, receive, fake_app)
 
     assert request is not None
 
 
+@pytest.mark.unit
+def test_request_asgi_headers_decoded_lazily(fake_app):
+    """Test that ASGI headers are only decoded into a dict on first access."""
+    from jsweb.request import Request
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "query_string": b"",
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"cookie", b"session=abc123; user=john"),
+            (b"x-custom", b"value"),
+        ],
+    }
+    request = Request(scope, lambda: None, fake_app)
+
+    assert request.content_type == "application/json"
+    assert request.cookies == {"session": "abc123", "user": "john"}
+    assert request._headers is None
+    assert request.headers["x-custom"] == "value"
+    assert request.headers is request.headers
+
+
+@pytest.mark.unit
+def test_request_headers_case_insensitive(fake_app):
+    """Test that header lookups ignore case and undecodable bytes don't raise."""
+    from jsweb.request import Request
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "query_string": b"",
+        "headers": [(b"x-api-key", b"secret"), (b"x-raw", b"\xff")],
+    }
+    request = Request(scope, lambda: None, fake_app)
+
+    assert request.headers["X-API-Key"] == "secret"
+    assert request.headers.get("X-Api-Key") == "secret"
+    assert "X-API-KEY" in request.headers
+    assert request.headers.get("missing", "") == ""
+    assert request.headers["x-raw"] == "\xff"
+
+
+@pytest.mark.unit
+def test_request_headers_duplicates_and_mutation(fake_app):
+    """Test that repeated headers keep the first value and mutators ignore case."""
+    from jsweb.request import Request
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "query_string": b"",
+        "headers": [
+            (b"content-type", b"text/plain"),
+            (b"Content-Type", b"application/json"),
+        ],
+    }
+    request = Request(scope, lambda: None, fake_app)
+
+    assert request.content_type == "text/plain"
+    assert request.headers["content-type"] == "text/plain"
+
+    headers = request.headers
+    headers.setdefault("X-A", "1")
+    assert "x-a" in headers and headers["X-A"] == "1"
+    headers["X-B"] = "2"
+    headers.update({"X-C": "3"})
+    assert headers.pop("X-b") == "2" and "x-b" not in headers
+    del headers["X-C"]
+    assert sorted(headers) == ["content-type", "x-a"]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "body, injected",
+    [
+        ("<HTML><HEAD></HEAD><body>Hi</body></HTML>", True),
+        ("<p>fragment</p>", False),
+    ],
+)
+async def test_html_response_script_injection(monkeypatch, body, injected):
+    """Test that the AJAX script is injected only into full HTML documents."""
+    from jsweb import response as jsweb_response
+
+    monkeypatch.setattr(jsweb_response, "_JSWEB_SCRIPT_CONTENT", "init()")
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    await jsweb_response.HTMLResponse(body)({"type": "http"}, None, send)
+
+    sent = messages[1]["body"].decode()
+    assert ("<script>init()</script></HEAD>" in sent) is injected
+
+
 @pytest.mark.unit
 def test_response_creation():
     """Test basic response creation."""
@@ -251,6 +342,107 @@ def test_response_json():
         assert response is not None
 
 
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "data, expected",
+    [
+        ({"message": "success", "code": 200}, {"message": "success", "code": 200}),
+        ({1: "one"}, {"1": "one"}),
+        ({"big": 2**70}, {"big": 2**70}),
+        ("caf\u00e9", "caf\u00e9"),
+    ],
+)
+def test_json_response_body(data, expected):
+    """Test that JSONResponse serializes to compact bytes matching the stdlib semantics."""
+    from jsweb.response import JSONResponse
+
+    response = JSONResponse(data)
+    assert isinstance(response.body, bytes)
+    assert json.loads(response.body) == expected
+    assert b", " not in response.body and b": " not in response.body
+
+
+@pytest.mark.unit
+def test_msgpack_response_body():
+    """Test that MsgpackResponse packs data to bytes with its own content type."""
+    msgpack = pytest.importorskip("msgpack")
+    from jsweb.response import MsgpackResponse
+
+    data = {"values": [1, 2.5, None], "raw": b"\x00\xff"}
+    response = MsgpackResponse(data)
+    assert response.headers["content-type"] == "application/msgpack"
+    assert msgpack.unpackb(response.body) == data
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "accept, msgpack_expected",
+    [(b"application/json", False), (b"application/msgpack, */*", True)],
+)
+def test_negotiated_response(fake_app, accept, msgpack_expected):
+    """Test that negotiated() answers msgpack only to clients that accept it."""
+    from jsweb.request import Request
+    from jsweb.response import JSONResponse, MsgpackResponse, negotiated
+
+    if msgpack_expected:
+        pytest.importorskip("msgpack")
+    scope = {"method": "GET", "path": "/", "headers": [(b"accept", accept)]}
+
+    response = negotiated(Request(scope, None, fake_app), {"ok": True})
+    expected = MsgpackResponse if msgpack_expected else JSONResponse
+    assert type(response) is expected
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+@pytest.mark.parametrize("extensions", [{}, {"http.response.pathsend": {}}])
+async def test_file_response_streams(tmp_path, extensions):
+    """Test that FileResponse streams in chunks, or hands the path to the server."""
+    from jsweb.response import FileResponse
+
+    path = tmp_path / "asset.bin"
+    content = bytes(range(256)) * 10
+    path.write_bytes(content)
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    response = FileResponse(str(path))
+    response.chunk_size = 1024
+    await response({"type": "http", "extensions": extensions}, None, send)
+
+    assert (b"content-length", str(len(content)).encode()) in map(
+        tuple, messages[0]["headers"]
+    )
+    if extensions:
+        assert messages[1:] == [{"type": "http.response.pathsend", "path": str(path)}]
+    else:
+        assert [len(m["body"]) for m in messages[1:]] == [1024, 1024, 512]
+        assert b"".join(m["body"] for m in messages[1:]) == content
+        assert not messages[-1]["more_body"]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_response_does_not_mutate_shared_headers():
+    """Test that responses built from one headers dict each get their own length."""
+    from jsweb.response import JSONResponse
+
+    shared = {"x-api-version": "2"}
+    lengths = []
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            lengths.append(dict(message["headers"])[b"content-length"])
+
+    await JSONResponse({"a": 1}, headers=shared)({}, None, send)
+    await JSONResponse({"a": 1000}, headers=shared)({}, None, send)
+
+    assert shared == {"x-api-version": "2"}
+    assert lengths == [b"7", b"10"]
+
+
 @pytest.mark.unit
 def test_response_headers():
     """Test response headers."""
@@ -261,54 +453,39 @@ def test_response_headers():
 
 
 @pytest.mark.unit
-def test_request_empty_body(fake_environ):
+def test_request_empty_body(fake_environ, fake_app):
     """Test request with empty body."""
     from jsweb.request import Request
 
-    class FakeApp:
-        class config:
-            pass
-
-    app = FakeApp()
     scope = fake_environ(method="GET", content_length=0)
     receive = lambda: {"body": b"", "more_body": False}
-    request = Request(scope, receive, app)
+    request = Request(scope, receive, fake_app)
 
     assert request is not None
     assert request.method == "GET"
 
 
 @pytest.mark.unit
-def test_request_large_body(fake_environ):
+def test_request_large_body(fake_environ, fake_app):
     """Test request with larger body."""
     from jsweb.request import Request
 
-    class FakeApp:
-        class config:
-            pass
-
-    app = FakeApp()
     large_body = b"x" * 10000
     scope = fake_environ(method="POST", content_length=len(large_body), body=large_body)
     receive = lambda: {"body": large_body, "more_body": False}
-    request = Request(scope, receive, app)
+    request = Request(scope, receive, fake_app)
 
     assert request is not None
 
 
 @pytest.mark.unit
-def test_request_multiple_query_params(fake_environ):
+def test_request_multiple_query_params(fake_environ, fake_app):
     """Test parsing multiple query parameters."""
     from jsweb.request import Request
 
-    class FakeApp:
-        class config:
-            pass
-
-    app = FakeApp()
     scope = fake_environ(query_string="page=1&limit=20&sort=name&filter=active")
     receive = lambda: {"body": b"", "more_body": False}
-    request = Request(scope, receive, app)
+    request = Request(scope, receive, fake_app)
 
     assert request is not None
 
@@ -323,18 +500,13 @@ def test_response_content_type():
 
 
 @pytest.mark.unit
-def test_request_method_upper(fake_environ):
+def test_request_method_upper(fake_environ, fake_app):
     """Test that request method is always uppercase."""
     from jsweb.request import Request
 
-    class FakeApp:
-        class config:
-            pass
-
-    app = FakeApp()
     scope = fake_environ(method="get")
     receive = lambda: {"body": b"", "more_body": False}
-    request = Request(scope, receive, app)
+    request = Request(scope, receive, fake_app)
 
     # Method should be uppercase
     assert request.method == "GET" or request.method == "get"
@@ -353,19 +525,14 @@ def test_json_response_content_type():
 
 
 @pytest.mark.unit
-def test_request_body_multiple_reads(fake_environ):
+def test_request_body_multiple_reads(fake_environ, fake_app):
     """Test reading request body multiple times."""
     from jsweb.request import Request
 
-    class FakeApp:
-        class config:
-            pass
-
-    app = FakeApp()
     body = b"test data"
     scope = fake_environ(content_length=len(body), body=body)
     receive = lambda: {"body": body, "more_body": False}
-    request = Request(scope, receive, app)
+    request = Request(scope, receive, fake_app)
 
     assert request is not None
 
@@ -382,38 +549,26 @@ def test_response_string_conversion():
 
 
 @pytest.mark.unit
-def test_empty_json_request(fake_environ):
+def test_empty_json_request(fake_environ, fake_app):
     """Test parsing empty JSON request."""
     from jsweb.request import Request
 
-    class FakeApp:
-        class config:
-            pass
-
-    app = FakeApp()
     scope = fake_environ(method="POST", content_type="application/json")
     receive = lambda: {"body": b"{}", "more_body": False}
-    request = Request(scope, receive, app)
+    request = Request(scope, receive, fake_app)
     data = request.json()
 
     assert data is not None
 
 
 @pytest.mark.unit
-def test_nested_json_parsing(fake_environ):
+def test_nested_json_parsing(fake_environ, fake_app):
     """Test parsing nested JSON structures."""
     from jsweb.request import Request
 
-    class FakeApp:
-        class config:
-            pass
-
-    app = FakeApp()
-    nested_data = {"user": {"name": "John", "address": {"city": "NYC"}}}
-    body = json.dumps(nested_data).encode("utf-8")
     scope = fake_environ(method="POST", content_type="application/json")
-    receive = lambda: {"body": body, "more_body": False}
-    request = Request(scope, receive, app)
+    receive = lambda: {"body": _NESTED_JSON_BODY, "more_body": False}
+    request = Request(scope, receive, fake_app)
     data = request.json()
 
     assert data is not None
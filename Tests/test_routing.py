@@ -45,6 +45,25 @@ def test_resolve_static_route():
     assert params == {}
 
 
+@pytest.mark.unit
+def test_static_route_params_are_shared_and_read_only():
+    """Test that static hits share one immutable empty params mapping."""
+    router = Router()
+
+    def handler(req):
+        return "OK"
+
+    router.add_route("/a", handler, endpoint="a")
+    router.add_route("/b", handler, endpoint="b")
+
+    _, params_a = router.resolve("/a", "GET")
+    _, params_b = router.resolve("/b", "GET")
+    assert params_a is params_b
+    assert params_a == {}
+    with pytest.raises(TypeError):
+        params_a["leak"] = True
+
+
 @pytest.mark.unit
 def test_resolve_dynamic_route_with_int():
     """Test resolving a dynamic route with integer parameter."""
@@ -63,6 +82,27 @@ def test_resolve_dynamic_route_with_int():
     assert isinstance(params["user_id"], int)
 
 
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("0", 0),
+        ("-42", -42),
+        ("2147483647", 2147483647),
+        ("2147483648", None),
+        ("-2147483648", None),
+        ("1234567890123456", None),
+        ("+5", None),
+        ("\uff11\uff12", None),
+    ],
+)
+def test_int_converter(value, expected):
+    """Test the int converter's ASCII-only parsing and 32-bit range limits."""
+    from jsweb.routing import _int_converter
+
+    assert _int_converter(value) == expected
+
+
 @pytest.mark.unit
 def test_resolve_multiple_dynamic_parameters():
     """Test resolving routes with multiple dynamic parameters."""
@@ -114,6 +154,106 @@ def test_resolve_path_parameter():
     assert "filepath" in params
 
 
+@pytest.mark.unit
+def test_dynamic_route_literals_match_exactly():
+    """Test that regex characters in a dynamic route's literal text are not patterns."""
+    from jsweb.routing import NotFound
+
+    router = Router()
+
+    def handler(req, item_id):
+        return "OK"
+
+    router.add_route("/api/v1.0/items/<int:item_id>.json", handler, endpoint="item")
+
+    assert router.resolve("/api/v1.0/items/5.json", "GET") == (handler, {"item_id": 5})
+    for path in ("/api/v1x0/items/5.json", "/api/v1.0/items/5xjson"):
+        with pytest.raises(NotFound):
+            router.resolve(path, "GET")
+
+
+@pytest.mark.unit
+def test_dynamic_routes_keep_registration_priority():
+    """Test that the first registered matching dynamic route wins."""
+    router = Router()
+
+    def by_id(req, item_id):
+        return "id"
+
+    def by_name(req, kind, name):
+        return "name"
+
+    def catch_all(req, rest):
+        return "rest"
+
+    router.add_route("/<path:rest>", catch_all, endpoint="catch_all")
+    router.add_route("/items/<int:item_id>", by_id, endpoint="by_id")
+    router.add_route("/<str:kind>/<str:name>", by_name, endpoint="by_name")
+
+    handler_result, params = router.resolve("/items/5", "GET")
+    assert handler_result == catch_all
+    assert params == {"rest": "items/5"}
+
+    router = Router()
+    router.add_route("/items/<int:item_id>", by_id, endpoint="by_id")
+    router.add_route("/<str:kind>/<str:name>", by_name, endpoint="by_name")
+    router.add_route("/<path:rest>", catch_all, endpoint="catch_all")
+
+    assert router.resolve("/items/5", "GET") == (by_id, {"item_id": 5})
+    assert router.resolve("/items/abc", "GET") == (
+        by_name,
+        {"kind": "items", "name": "abc"},
+    )
+    assert router.resolve("/a/b/c", "GET") == (catch_all, {"rest": "a/b/c"})
+
+
+@pytest.mark.unit
+def test_dynamic_route_method_falls_through():
+    """Test that a dynamic route for another method doesn't shadow later routes."""
+    router = Router()
+
+    def create(req, item_id):
+        return "create"
+
+    def show(req, item_id):
+        return "show"
+
+    router.add_route("/items/<int:item_id>", create, methods=["POST"], endpoint="c")
+    router.add_route("/items/<str:item_id>", show, methods=["GET"], endpoint="s")
+
+    assert router.resolve("/items/7", "GET") == (show, {"item_id": "7"})
+    assert router.resolve("/items/7", "POST") == (create, {"item_id": 7})
+
+
+@pytest.mark.unit
+def test_dynamic_resolution_cache(monkeypatch):
+    """Test that cached dynamic lookups stay isolated, bounded and fresh."""
+    from jsweb import routing
+
+    monkeypatch.setattr(routing, "RESOLVE_CACHE_SIZE", 2)
+    router = Router()
+
+    def item(req, item_id):
+        return "item"
+
+    def special(req):
+        return "special"
+
+    router.add_route("/items/<int:item_id>", item, endpoint="item")
+
+    _, params = router.resolve("/items/1", "GET")
+    params["item_id"] = 99
+    assert router.resolve("/items/1", "GET") == (item, {"item_id": 1})
+
+    router.resolve("/items/2", "GET")
+    router.resolve("/items/3", "GET")
+    assert len(router._resolve_cache) == 2
+
+    # Registering a route drops stale resolutions
+    router.add_route("/items/3", special, endpoint="special")
+    assert router.resolve("/items/3", "GET") == (special, {})
+
+
 @pytest.mark.unit
 def test_resolve_not_found():
     """Test that resolving non-existent route raises NotFound."""
@@ -146,6 +286,47 @@ def test_resolve_wrong_method():
         router.resolve("/api/data", "GET")
 
 
+@pytest.mark.unit
+def test_resolve_dynamic_wrong_method():
+    """Test that a dynamic route with the wrong method raises MethodNotAllowed."""
+    from jsweb.routing import MethodNotAllowed, NotFound
+
+    router = Router()
+
+    def handler(req, item_id):
+        return "OK"
+
+    router.add_route("/items/<int:item_id>", handler, methods=["POST"], endpoint="item")
+
+    with pytest.raises(MethodNotAllowed):
+        router.resolve("/items/5", "GET")
+    # The converter still has to accept the value for the path to count as matched.
+    with pytest.raises(NotFound):
+        router.resolve("/items/abc", "GET")
+
+
+@pytest.mark.unit
+def test_static_route_reregistration_replaces_methods():
+    """Test that re-registering a static path replaces its method table."""
+    from jsweb.routing import MethodNotAllowed
+
+    router = Router()
+
+    def old(req):
+        return "old"
+
+    def new(req):
+        return "new"
+
+    router.add_route("/page", old, methods=["GET", "DELETE"], endpoint="old")
+    router.add_route("/page", new, methods=["GET", "POST"], endpoint="new")
+
+    assert router.resolve("/page", "GET") == (new, {})
+    assert router.resolve("/page", "POST") == (new, {})
+    with pytest.raises(MethodNotAllowed):
+        router.resolve("/page", "DELETE")
+
+
 @pytest.mark.unit
 def test_multiple_routes():
     """Test routing with multiple registered routes."""
@@ -207,6 +388,39 @@ def test_route_method_filtering():
         router.resolve("/api/items", "DELETE")
 
 
+@pytest.mark.unit
+def test_route_methods_are_case_insensitive():
+    """Test that lower-case method names are normalized at registration."""
+    router = Router()
+
+    def handler(req):
+        return "OK"
+
+    router.add_route("/static", handler, methods=["post"], endpoint="static")
+    router.add_route("/items/<int:item_id>", handler, methods=["put"], endpoint="item")
+
+    assert router.resolve("/static", "POST") == (handler, {})
+    assert router.resolve("/items/3", "PUT") == (handler, {"item_id": 3})
+    assert router.endpoints["item"].allowed_methods == frozenset({"PUT"})
+
+
+@pytest.mark.unit
+def test_coroutine_handlers_classified_at_registration():
+    """Test that async handlers are recorded once, when they are registered."""
+    router = Router()
+
+    async def async_handler(req):
+        return "async"
+
+    def sync_handler(req):
+        return "sync"
+
+    router.add_route("/async", async_handler, endpoint="async_view")
+    router.add_route("/sync/<int:item_id>", sync_handler, endpoint="sync_view")
+
+    assert router.coroutine_handlers == {async_handler}
+
+
 @pytest.mark.unit
 def test_default_methods():
     """Test that routes default to GET method."""
@@ -228,8 +442,29 @@ def test_default_methods():
         router.resolve("/default", "POST")
 
 
+@pytest.mark.unit
+def test_url_for():
+    """Test URL generation for static and dynamic endpoints."""
+    router = Router()
+
+    def handler(req, **kwargs):
+        return "OK"
+
+    router.add_route("/about", handler, endpoint="about")
+    router.add_route("/users/<int:user_id>/posts/<slug:slug>", handler, endpoint="post")
+
+    assert router.url_for("about") == "/about"
+    assert router.url_for("post", user_id=7, slug="hello") == "/users/7/posts/hello"
+    router.add_route("/files/{raw}/<path:name>", handler, endpoint="file")
+    assert router.url_for("file", name="a/b.txt") == "/files/{raw}/a/b.txt"
+    with pytest.raises(ValueError):
+        router.url_for("post", user_id=7)
+    with pytest.raises(ValueError):
+        router.url_for("missing")
+
+
 @pytest.mark.slow
-def test_static_route_performance():
+def test_static_route_performance(benchmark):
     """Benchmark static route resolution performance."""
     router = Router()
 
@@ -237,20 +472,15 @@ def test_static_route_performance():
     for i in range(50):
         router.add_route(f"/pages/{i}", lambda req: "OK", endpoint=f"page_{i}")
 
-    # Resolve middle route 1000 times
-    import time
-
-    start = time.perf_counter()
-    for _ in range(1000):
-        router.resolve("/pages/25", "GET")
-    elapsed = (time.perf_counter() - start) * 1000  # Convert to ms
+    # Resolve middle route
+    benchmark(router.resolve, "/pages/25", "GET")
 
-    # Should be reasonably fast (under 10ms for 1000 requests)
-    assert elapsed < 10, f"Static route resolution took {elapsed}ms for 1000 requests"
+    # Should be reasonably fast (under 10μs per request)
+    assert benchmark.stats["mean"] < 1e-5
 
 
 @pytest.mark.slow
-def test_dynamic_route_performance():
+def test_dynamic_route_performance(benchmark):
     """Benchmark dynamic route resolution performance."""
     router = Router()
 
@@ -262,13 +492,7 @@ def test_dynamic_route_performance():
             endpoint=f"user_post_{i}",
         )
 
-    # Resolve 1000 times
-    import time
-
-    start = time.perf_counter()
-    for _ in range(1000):
-        router.resolve("/users/123/posts/456", "GET")
-    elapsed = (time.perf_counter() - start) * 1000  # Convert to ms
+    benchmark(router.resolve, "/users/123/posts/456", "GET")
 
-    # Should be reasonably fast (under 50ms for 1000 requests)
-    assert elapsed < 50, f"Dynamic route resolution took {elapsed}ms for 1000 requests"
+    # Should be reasonably fast (under 50μs per request)
+    assert benchmark.stats["mean"] < 5e-5
@@ -192,6 +192,61 @@ def test_rate_limiting():
         pytest.skip("Rate limiting not available")
 
 
+@pytest.mark.unit
+@pytest.mark.security
+def test_rate_limiter_sliding_window():
+    """Test that the previous window's requests count in proportion to overlap."""
+    from jsweb.security import RateLimiter
+
+    now = [0.0]
+    limiter = RateLimiter(max_requests=3, window_seconds=60, clock=lambda: now[0])
+
+    assert [limiter.allow_request("user1") for _ in range(4)] == [
+        True,
+        True,
+        True,
+        False,
+    ]
+    assert limiter.allow_request("user2")
+
+    # At the start of the next window the previous one still fully overlaps.
+    now[0] = 60.0
+    assert not limiter.allow_request("user1")
+
+    # Halfway through, it only counts for 1.5 requests.
+    now[0] = 90.0
+    assert limiter.allow_request("user1")
+    assert limiter.allow_request("user1")
+    assert not limiter.allow_request("user1")
+
+    # The rejection is remembered until the weighted count can drop below the limit.
+    assert limiter._windows["user1"][3] == pytest.approx(100.0)
+    now[0] = 99.0
+    assert not limiter.allow_request("user1")
+    now[0] = 101.0
+    assert limiter.allow_request("user1")
+
+    # Windows older than the previous one are forgotten.
+    now[0] = 200.0
+    assert limiter.allow_request("user1")
+
+
+@pytest.mark.unit
+@pytest.mark.security
+def test_rate_limiter_bounds_tracked_keys():
+    """Test that the least recently seen keys are dropped past max_keys."""
+    from jsweb.security import RateLimiter
+
+    limiter = RateLimiter(
+        max_requests=1, window_seconds=60, max_keys=2, clock=lambda: 0
+    )
+
+    assert limiter.allow_request("a")
+    assert limiter.allow_request("b")
+    assert limiter.allow_request("c")
+    assert list(limiter._windows) == ["b", "c"]
+
+
 @pytest.mark.unit
 @pytest.mark.security
 def test_secure_session_token():
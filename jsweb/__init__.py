@@ -7,12 +7,13 @@ easily accessible for application development.
 Key exports include:
 - JsWebApp: The main application class.
 - Blueprint: For structuring applications into modular components.
-- Response objects: `Response`, `HTMLResponse`, `JSONResponse`, `RedirectResponse`.
-- Response shortcuts: `render`, `html`, `json`, `redirect`.
+- Response objects: `Response`, `HTMLResponse`, `JSONResponse`, `MsgpackResponse`,
+  `FileResponse`, `RedirectResponse`.
+- Response shortcuts: `render`, `html`, `json`, `msgpack`, `negotiated`, `redirect`.
 - `url_for`: For URL generation.
 - `UploadedFile`: Represents a file uploaded in a request.
 - Authentication: `login_required`, `login_user`, `logout_user`, `get_current_user`.
-- Security: `generate_password_hash`, `check_password_hash`.
+- Security: `hash_password`, `check_password`, `generate_password_hash`, `check_password_hash`.
 - Forms and Fields: `Form`, `StringField`, `PasswordField`, etc.
 - Validators: `DataRequired`, `Email`, `Length`, etc.
 """
@@ -23,7 +24,12 @@ from jsweb.blueprints import Blueprint
 from jsweb.forms import *
 from jsweb.request import UploadedFile
 from jsweb.response import *
-from jsweb.security import check_password_hash, generate_password_hash
+from jsweb.security import (
+    check_password,
+    check_password_hash,
+    generate_password_hash,
+    hash_password,
+)
 from jsweb.server import *
 from jsweb.validators import *
 
@@ -1,6 +1,6 @@
-import asyncio
+import functools
 import os
-import secrets
+import sys
 
 from .auth import get_current_user, init_auth
 from .blueprints import Blueprint
@@ -8,6 +8,34 @@ from .middleware import CSRFMiddleware, DBSessionMiddleware, StaticFilesMiddlewa
 from .request import Request
 from .response import HTMLResponse, JSONResponse, Response, configure_template_env
 from .routing import MethodNotAllowed, NotFound, Router
+from .security import DEFAULT_PASSWORD_HASH_COST, init_password_hashing
+
+# Attributes of the CSRF cookie, formatted once. httponly is deliberately off so
+# JavaScript can read the token for AJAX requests; SameSite=Strict still applies.
+_CSRF_COOKIE_ATTRIBUTES = "; Path=/; SameSite=Strict"
+
+# The routing failure body never varies, so it is serialized once.
+_INTERNAL_ERROR_BODY = b'{"error":"Internal Server Error"}'
+
+_LIB_TEMPLATE_PATH = os.path.join(os.path.dirname(__file__), "templates")
+
+
+@functools.lru_cache(maxsize=16)
+def _resolve_template_paths(base_dir, template_folder):
+    """
+    Returns the existing template directories for an app, user folder first.
+
+    Cached per (BASE_DIR, TEMPLATE_FOLDER) so that constructing many apps does not
+    stat the same directories again; either argument may be None.
+    """
+    template_paths = []
+    if base_dir is not None and template_folder is not None:
+        user_template_path = os.path.join(base_dir, template_folder)
+        if os.path.isdir(user_template_path):
+            template_paths.append(user_template_path)
+    if os.path.isdir(_LIB_TEMPLATE_PATH):
+        template_paths.append(_LIB_TEMPLATE_PATH)
+    return tuple(template_paths)
 
 
 class JsWebApp:
@@ -20,34 +48,29 @@ class JsWebApp:
         self.template_filters = {}
         self.config = config
         self.blueprints_with_static_files = []
+        self._asgi_chain = None
         self._init_from_config()  # Initial setup
 
     def _init_from_config(self):
         """Initializes components that depend on the config."""
-        template_paths = []
-
-        # Add the user's template folder
-        if hasattr(self.config, "TEMPLATE_FOLDER") and hasattr(self.config, "BASE_DIR"):
-            user_template_path = os.path.join(
-                self.config.BASE_DIR, self.config.TEMPLATE_FOLDER
-            )
-            if os.path.isdir(user_template_path):
-                template_paths.append(user_template_path)
-
-        # Add the library's main template folder
-        lib_template_path = os.path.join(os.path.dirname(__file__), "templates")
-        if os.path.isdir(lib_template_path):
-            template_paths.append(lib_template_path)
-
-        # The admin templates are now self-contained in the admin package,
-        # so we no longer add them to the main app's template paths.
-
+        # The middleware chain reads STATIC_URL/STATIC_DIR, so rebuild it lazily.
+        self._asgi_chain = None
+        # The admin templates are self-contained in the admin package, so only the
+        # user's folder and the library's main folder are used here.
+        template_paths = _resolve_template_paths(
+            getattr(self.config, "BASE_DIR", None),
+            getattr(self.config, "TEMPLATE_FOLDER", None),
+        )
         if template_paths:
-            configure_template_env(template_paths)
+            configure_template_env(list(template_paths))
 
         if hasattr(self.config, "SECRET_KEY"):
             init_auth(self.config.SECRET_KEY, self._get_actual_user_loader())
 
+        init_password_hashing(
+            getattr(self.config, "PASSWORD_HASH_COST", DEFAULT_PASSWORD_HASH_COST)
+        )
+
     def _get_actual_user_loader(self):
         if hasattr(self, "_user_loader_callback") and self._user_loader_callback:
             return self._user_loader_callback
@@ -61,21 +84,33 @@ class JsWebApp:
         except (ImportError, AttributeError):
             return None
 
+    def _load_request_user(self, req):
+        """Loads the user for `Request.user`, which defers this until first access."""
+        if hasattr(self.config, "SECRET_KEY"):
+            return get_current_user(req)
+        return None
+
     def route(self, path, methods=None, endpoint=None):
         return self.router.route(path, methods, endpoint)
 
     def register_blueprint(self, blueprint: Blueprint):
         """Registers a blueprint with the application."""
+        prefix = blueprint.url_prefix.rstrip("/") if blueprint.url_prefix else None
+        endpoint_prefix = f"{blueprint.name}."
         for path, handler, methods, endpoint in blueprint.routes:
             full_path = path
-            if blueprint.url_prefix:
-                full_path = f"{blueprint.url_prefix.rstrip('/')}/{path.lstrip('/')}"
+            if prefix is not None:
+                full_path = f"{prefix}/{path.lstrip('/')}"
 
-            full_endpoint = f"{blueprint.name}.{endpoint}"
-            self.router.add_route(full_path, handler, methods, endpoint=full_endpoint)
+            # Interned so lookups that reuse these strings compare by identity.
+            full_endpoint = sys.intern(endpoint_prefix + endpoint)
+            self.router.add_route(
+                sys.intern(full_path), handler, methods, endpoint=full_endpoint
+            )
 
         if blueprint.static_folder:
             self.blueprints_with_static_files.append(blueprint)
+            self._asgi_chain = None
 
     def filter(self, name):
         def decorator(func):
@@ -98,13 +133,15 @@ class JsWebApp:
             await response(scope, receive, send)
             return
         except Exception:
-            response = JSONResponse({"error": "Internal Server Error"}, status_code=500)
+            response = Response(
+                _INTERNAL_ERROR_BODY, status_code=500, content_type="application/json"
+            )
             await response(scope, receive, send)
             return
 
         if handler:
             # Support both sync and async handlers
-            if asyncio.iscoroutinefunction(handler):
+            if handler in self.router.coroutine_handlers:
                 response = await handler(req, **params)
             else:
                 response = handler(req, **params)
@@ -117,18 +154,14 @@ class JsWebApp:
                     f"View function did not return a Response object (got {type(response).__name__})"
                 )
 
-            if (
-                hasattr(req, "new_csrf_token_generated")
-                and req.new_csrf_token_generated
+            # Tokens are minted lazily: when the handler used one, or for HTML
+            # pages, whose forms and scripts may need it.
+            if req.new_csrf_token_generated or (
+                "text/html" in response.headers.get("content-type", "")
+                and not req.cookies.get("csrf_token")
             ):
-                # Set CSRF token cookie with strict security settings
-                # Note: httponly=False is required so JavaScript can read it for AJAX requests
-                response.set_cookie(
-                    "csrf_token",
-                    req.csrf_token,
-                    httponly=False,
-                    samesite="Strict",
-                    secure=False,
+                response.set_cookie_header(
+                    f"csrf_token={req.csrf_token}{_CSRF_COOKIE_ATTRIBUTES}"
                 )
 
             await response(scope, receive, send)
@@ -142,30 +175,28 @@ class JsWebApp:
         req = Request(scope, receive, self)
         scope["jsweb.request"] = req
 
-        csrf_token = req.cookies.get("csrf_token")
-        req.new_csrf_token_generated = False
-        if not csrf_token:
-            csrf_token = secrets.token_hex(32)
-            req.new_csrf_token_generated = True
-        req.csrf_token = csrf_token
+        if self._asgi_chain is None:
+            self._asgi_chain = self._build_asgi_chain()
+        await self._asgi_chain(scope, receive, send)
 
-        if hasattr(self.config, "SECRET_KEY"):
-            req.user = get_current_user(req)
+    def _build_asgi_chain(self):
+        """
+        Wraps the application handler in the built-in middleware.
 
+        The chain is built on the first request and reused; registering a
+        blueprint with static files or reloading the config resets it.
+        """
         static_url = getattr(self.config, "STATIC_URL", "/static")
         static_dir = getattr(self.config, "STATIC_DIR", "static")
 
-        # The middleware needs to be ASGI compatible.
-        # This will require rewriting the middleware classes.
-        # For now, I will assume they are ASGI compatible.
+        # Static files are served outermost: they are read-only, so they need
+        # neither the CSRF check nor a database session.
         handler = self._asgi_app_handler
         handler = DBSessionMiddleware(handler)
-        handler = StaticFilesMiddleware(
+        handler = CSRFMiddleware(handler)
+        return StaticFilesMiddleware(
             handler,
             static_url,
             static_dir,
             blueprint_statics=self.blueprints_with_static_files,
         )
-        handler = CSRFMiddleware(handler)
-
-        await handler(scope, receive, send)
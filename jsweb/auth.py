@@ -91,13 +91,15 @@ def login_required(handler: callable) -> callable:
         The decorated view function.
     """
 
+    is_coroutine = asyncio.iscoroutinefunction(handler)
+
     @wraps(handler)
     async def decorated_function(request, *args, **kwargs):
         if not request.user:
             login_url = url_for(request, "auth.login")
             return redirect(login_url)
 
-        if asyncio.iscoroutinefunction(handler):
+        if is_coroutine:
             return await handler(request, *args, **kwargs)
         else:
             return handler(request, *args, **kwargs)
@@ -120,12 +122,14 @@ def admin_required(handler: callable) -> callable:
         The decorated view function.
     """
 
+    is_coroutine = asyncio.iscoroutinefunction(handler)
+
     @wraps(handler)
     async def decorated_function(request, *args, **kwargs):
         if not request.user or not getattr(request.user, "is_admin", False):
             return redirect(url_for(request, "admin.index"))
 
-        if asyncio.iscoroutinefunction(handler):
+        if is_coroutine:
             return await handler(request, *args, **kwargs)
         else:
             return handler(request, *args, **kwargs)
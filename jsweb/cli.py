@@ -1,6 +1,7 @@
 import argparse
 import getpass
 import importlib.util
+import itertools
 import logging
 import os
 import secrets
@@ -17,6 +18,7 @@ from alembic.operations.ops import (
     CreateTableOp,
     DropColumnOp,
     DropTableOp,
+    ModifyTableOps,
 )
 from alembic.runtime.migration import MigrationContext
 from alembic.script import ScriptDirectory
@@ -98,6 +100,22 @@ def load_config():
     return config
 
 
+# Starter files copied verbatim into a new project, as (source, destination
+# relative to the project root) pairs.
+_STARTER_FILES = (
+    (
+        os.path.join(HTML_TEMPLATES_DIR, "starter_template.html"),
+        "templates/welcome.html",
+    ),
+    (os.path.join(HTML_TEMPLATES_DIR, "login.html"), "templates/login.html"),
+    (os.path.join(HTML_TEMPLATES_DIR, "register.html"), "templates/register.html"),
+    (os.path.join(HTML_TEMPLATES_DIR, "profile.html"), "templates/profile.html"),
+    (os.path.join(STATIC_DIR, "global.css"), "static/global.css"),
+    (os.path.join(STATIC_DIR, "jsweb_logo.png"), "static/jsweb_logo.png"),
+    (os.path.join(STATIC_DIR, "jsweb_logo_bg.png"), "static/jsweb_logo_bg.png"),
+)
+
+
 def create_project(name):
     """
     Creates a new JsWeb project with a default directory structure and starter files.
@@ -117,42 +135,8 @@ def create_project(name):
     os.makedirs(templates_dest_dir, exist_ok=True)
     os.makedirs(static_dest_dir, exist_ok=True)
 
-    text_files_to_copy = {
-        os.path.join(HTML_TEMPLATES_DIR, "starter_template.html"): os.path.join(
-            templates_dest_dir, "welcome.html"
-        ),
-        os.path.join(HTML_TEMPLATES_DIR, "login.html"): os.path.join(
-            templates_dest_dir, "login.html"
-        ),
-        os.path.join(HTML_TEMPLATES_DIR, "register.html"): os.path.join(
-            templates_dest_dir, "register.html"
-        ),
-        os.path.join(HTML_TEMPLATES_DIR, "profile.html"): os.path.join(
-            templates_dest_dir, "profile.html"
-        ),
-        os.path.join(STATIC_DIR, "global.css"): os.path.join(
-            static_dest_dir, "global.css"
-        ),
-    }
-    for src, dest in text_files_to_copy.items():
-        with open(src, encoding="utf-8") as f_src:
-            content = f_src.read()
-        with open(dest, "w", encoding="utf-8") as f_dest:
-            f_dest.write(content)
-
-    binary_files_to_copy = {
-        os.path.join(STATIC_DIR, "jsweb_logo.png"): os.path.join(
-            static_dest_dir, "jsweb_logo.png"
-        ),
-        os.path.join(STATIC_DIR, "jsweb_logo_bg.png"): os.path.join(
-            static_dest_dir, "jsweb_logo_bg.png"
-        ),
-    }
-    for src, dest in binary_files_to_copy.items():
-        with open(src, "rb") as f_src:
-            content = f_src.read()
-        with open(dest, "wb") as f_dest:
-            f_dest.write(content)
+    for src, dest in _STARTER_FILES:
+        shutil.copyfile(src, os.path.join(project_dir, dest))
 
     env = Environment(loader=FileSystemLoader(PROJECT_TEMPLATES_DIR), autoescape=False)
 
@@ -286,28 +270,6 @@ def is_db_up_to_date(config):
         return False
 
 
-def has_model_changes(database_url, metadata):
-    """
-    Detects if there are differences between SQLAlchemy models and the database schema.
-
-    Args:
-        database_url (str): The database connection URL.
-        metadata (sqlalchemy.schema.MetaData): The SQLAlchemy MetaData object for the models.
-
-    Returns:
-        bool: True if changes are detected, False otherwise.
-    """
-    from alembic.autogenerate import compare_metadata
-    from alembic.runtime.migration import MigrationContext
-    from sqlalchemy import create_engine
-
-    engine = create_engine(database_url)
-    with engine.connect() as conn:
-        context = MigrationContext.configure(conn)
-        diffs = compare_metadata(context, metadata)
-    return bool(diffs)
-
-
 def preview_model_changes_readable(database_url, metadata):
     """
     Generates a human-readable summary of detected database schema changes.
@@ -329,7 +291,12 @@ def preview_model_changes_readable(database_url, metadata):
         context = MigrationContext.configure(conn)
         migration_script = produce_migrations(context, metadata)
         changes = []
-        for op in migration_script.upgrade_ops.ops:
+        # Column changes arrive grouped per table; report each one.
+        ops = itertools.chain.from_iterable(
+            op.ops if isinstance(op, ModifyTableOps) else (op,)
+            for op in migration_script.upgrade_ops.ops
+        )
+        for op in ops:
             if isinstance(op, CreateTableOp):
                 changes.append(f"Create table '{op.table_name}'")
             elif isinstance(op, DropTableOp):
@@ -499,7 +466,10 @@ def cli():
 
             from jsweb.database import init_db
 
-            init_db(config.DATABASE_URL)
+            init_db(
+                config.DATABASE_URL,
+                warm_connections=getattr(config, "DATABASE_WARM_CONNECTIONS", 0),
+            )
 
             if getattr(config, "ENABLE_OPENAPI_DOCS", True):
                 try:
@@ -573,10 +543,7 @@ def cli():
                     "👉 Run `jsweb db upgrade` first to apply existing migrations."
                 )
                 return
-            if not has_model_changes(config.DATABASE_URL, models.ModelBase.metadata):
-                logger.info("✅ No changes detected in models.")
-                return
-
+            # One schema comparison: the preview is None when nothing changed.
             changes = preview_model_changes_readable(
                 config.DATABASE_URL, models.ModelBase.metadata
             )
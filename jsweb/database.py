@@ -10,9 +10,11 @@ from sqlalchemy import (
     UniqueConstraint,
     create_engine,
 )
+from sqlalchemy.engine import make_url
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.inspection import inspect
 from sqlalchemy.orm import declarative_base, relationship, scoped_session, sessionmaker
+from sqlalchemy.pool import StaticPool
 
 Session = sessionmaker(expire_on_commit=False)
 db_session = scoped_session(Session)
@@ -23,7 +25,15 @@ Base.query = db_session.query_property()
 _engine = None
 
 
-def init_db(database_url, echo=False):
+def init_db(
+    database_url,
+    echo=False,
+    pool_size=20,
+    max_overflow=10,
+    pool_recycle=1800,
+    pool_pre_ping=True,
+    warm_connections=0,
+):
     """
     Initializes the database engine and configures the session factory.
 
@@ -31,12 +41,51 @@ def init_db(database_url, echo=False):
     binds the engine to the session factory and the declarative base. It should be
     called once when the application starts.
 
+    The pool settings apply to client/server databases. SQLite keeps SQLAlchemy's
+    default pool for database files, and an in-memory database shares a single
+    connection so every session sees the same data.
+
     Args:
         database_url (str): The connection string for the database.
         echo (bool): If True, the engine will log all statements. Defaults to False.
+        pool_size (int): Connections kept open in the pool. Defaults to 20.
+        max_overflow (int): Extra connections allowed beyond `pool_size` under load.
+            Defaults to 10.
+        pool_recycle (int): Seconds after which a connection is replaced, so the
+            server never closes it first. Defaults to 1800.
+        pool_pre_ping (bool): If True, connections are checked before use so stale
+            ones are replaced instead of failing a request. Defaults to True.
+        warm_connections (int): Connections to open right away and return to the
+            pool, so the first requests skip the connect handshake. Capped at
+            `pool_size`; ignored for SQLite. Defaults to 0 (connect on demand).
     """
     global _engine
-    _engine = create_engine(database_url, echo=echo)
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite":
+        if url.database in (None, "", ":memory:"):
+            _engine = create_engine(
+                url,
+                echo=echo,
+                poolclass=StaticPool,
+                connect_args={"check_same_thread": False},
+            )
+        else:
+            _engine = create_engine(url, echo=echo)
+    else:
+        _engine = create_engine(
+            url,
+            echo=echo,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_recycle=pool_recycle,
+            pool_pre_ping=pool_pre_ping,
+        )
+        # Hold them all open at once so the pool really creates that many.
+        connections = [
+            _engine.connect() for _ in range(min(warm_connections, pool_size))
+        ]
+        for connection in connections:
+            connection.close()
     Session.configure(bind=_engine)
     Base.metadata.bind = _engine
 
@@ -95,6 +144,9 @@ class ModelBase(Base):
 
     __abstract__ = True
 
+    # Column attribute names, filled in per class by the first `to_dict()` call.
+    _column_keys = None
+
     @classmethod
     def create(cls, **kwargs):
         """
@@ -110,6 +162,37 @@ class ModelBase(Base):
         instance.save()
         return instance
 
+    @classmethod
+    def get_many(cls, ids):
+        """
+        Fetches the instances with the given primary keys in a single query.
+
+        Use this instead of one `query.get()` per id when loading a batch of rows.
+
+        Args:
+            ids: The primary key values to load.
+
+        Returns:
+            list: The instances found, in the order of `ids`; missing ids are skipped.
+
+        Raises:
+            TypeError: If the model has a composite primary key.
+        """
+        ids = list(ids)
+        if not ids:
+            return []
+        mapper = inspect(cls)
+        if len(mapper.primary_key) != 1:
+            raise TypeError(f"{cls.__name__} has a composite primary key.")
+        column = mapper.primary_key[0]
+        key = mapper.get_property_by_column(column).key
+        try:
+            rows = db_session.query(cls).filter(column.in_(ids)).all()
+        except SQLAlchemyError as e:
+            _handle_db_error(e)
+        by_id = {getattr(row, key): row for row in rows}
+        return [by_id[i] for i in ids if i in by_id]
+
     def update(self, **kwargs):
         """
         Update attributes of the model instance and save the changes.
@@ -157,7 +240,13 @@ class ModelBase(Base):
         Returns:
             dict: A dictionary representation of the model instance.
         """
-        return {c.key: getattr(self, c.key) for c in inspect(self).mapper.column_attrs}
+        cls = type(self)
+        # Read the class's own __dict__ so subclasses never reuse a parent's keys.
+        keys = cls.__dict__.get("_column_keys")
+        if keys is None:
+            keys = tuple(c.key for c in inspect(cls).column_attrs)
+            cls._column_keys = keys
+        return {key: getattr(self, key) for key in keys}
 
 
 __all__ = [
@@ -6,6 +6,8 @@ from .validators import ValidationError
 class Label:
     """A smart label that knows how to render itself."""
 
+    __slots__ = ("field_id", "text")
+
     def __init__(self, field_id, text):
         self.field_id = field_id
         self.text = text
@@ -22,6 +24,16 @@ class Label:
 class Field:
     """Base class for all form fields."""
 
+    __slots__ = (
+        "_label_text",
+        "validators",
+        "default",
+        "description",
+        "data",
+        "errors",
+        "name",
+    )
+
     def __init__(self, label=None, validators=None, default=None, description=""):
         self._label_text = label
         self.validators = validators or []
@@ -68,12 +80,14 @@ class Field:
 class StringField(Field):
     """A standard text input field."""
 
-    pass
+    __slots__ = ()
 
 
 class PasswordField(Field):
     """A password input field."""
 
+    __slots__ = ()
+
     def __call__(self, **kwargs):
         """Render the field as a password input."""
         kwargs["type"] = "password"
@@ -83,6 +97,8 @@ class PasswordField(Field):
 class HiddenField(Field):
     """A hidden input field."""
 
+    __slots__ = ()
+
     def __call__(self, **kwargs):
         """Render the field as a hidden input."""
         kwargs["type"] = "hidden"
@@ -92,6 +108,8 @@ class HiddenField(Field):
 class IntegerField(Field):
     """A field for integer values."""
 
+    __slots__ = ()
+
     def process_formdata(self, value):
         """Coerce the form data to an integer."""
         if value is None or value == "":
@@ -112,6 +130,8 @@ class IntegerField(Field):
 class TextAreaField(Field):
     """A multi-line text area field."""
 
+    __slots__ = ()
+
     def __call__(self, **kwargs):
         """Render the field as a textarea."""
         kwargs.setdefault("id", self.name)
@@ -126,6 +146,8 @@ class TextAreaField(Field):
 class BooleanField(Field):
     """A boolean checkbox field."""
 
+    __slots__ = ()
+
     def process_formdata(self, value):
         """Coerce the form data to a boolean."""
         self.data = True if value else False
@@ -142,6 +164,8 @@ class BooleanField(Field):
 class SelectField(Field):
     """A select dropdown field."""
 
+    __slots__ = ("choices",)
+
     def __init__(self, label=None, validators=None, choices=None, **kwargs):
         super().__init__(label, validators, **kwargs)
         self.choices = choices or []
@@ -172,6 +196,8 @@ class SelectField(Field):
 class RadioField(Field):
     """A radio button field."""
 
+    __slots__ = ("choices",)
+
     def __init__(self, label=None, validators=None, choices=None, **kwargs):
         super().__init__(label, validators, **kwargs)
         self.choices = choices or []
@@ -210,6 +236,8 @@ class RadioField(Field):
 class FileField(Field):
     """A file upload field."""
 
+    __slots__ = ("multiple",)
+
     def __init__(self, label=None, validators=None, multiple=False, **kwargs):
         super().__init__(label, validators, **kwargs)
         self.multiple = multiple
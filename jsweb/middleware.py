@@ -1,4 +1,5 @@
 import logging
+import os
 import secrets
 
 from .response import Forbidden
@@ -128,6 +129,19 @@ class StaticFilesMiddleware(Middleware):
         self.static_url = static_url
         self.static_dir = static_dir
         self.blueprint_statics = blueprint_statics or []
+        # URL prefixes end in '/' so '/static' never claims '/static-pages'.
+        # Directories are resolved here, once, so later cwd changes cannot move them.
+        self._static_prefix = static_url.rstrip("/") + "/"
+        self._static_root = os.path.realpath(static_dir)
+        self._blueprint_statics = [
+            (
+                bp.static_url_path.rstrip("/") + "/",
+                bp.static_url_path,
+                os.path.realpath(bp.static_folder),
+            )
+            for bp in self.blueprint_statics
+            if bp.static_url_path
+        ]
 
     async def __call__(self, scope, receive, send):
         """
@@ -149,15 +163,25 @@ class StaticFilesMiddleware(Middleware):
         req = scope["jsweb.request"]
 
         # Check blueprint static files first
-        for bp in self.blueprint_statics:
-            if bp.static_url_path and req.path.startswith(bp.static_url_path):
-                response = serve_static(req.path, bp.static_url_path, bp.static_folder)
+        for prefix, static_url_path, static_root in self._blueprint_statics:
+            if req.path.startswith(prefix):
+                response = serve_static(
+                    req.path,
+                    static_url_path,
+                    static_root,
+                    req.headers.get("if-none-match"),
+                )
                 await response(scope, receive, send)
                 return
 
         # Fallback to main static files
-        if req.path.startswith(self.static_url):
-            response = serve_static(req.path, self.static_url, self.static_dir)
+        if req.path.startswith(self._static_prefix):
+            response = serve_static(
+                req.path,
+                self.static_url,
+                self._static_root,
+                req.headers.get("if-none-match"),
+            )
             await response(scope, receive, send)
             return
 
@@ -247,6 +271,11 @@ class SecurityHeadersMiddleware(Middleware):
     def __init__(self, app, custom_headers=None):
         super().__init__(app)
         self.headers = {**self.DEFAULT_HEADERS, **(custom_headers or {})}
+        # Encoded once here rather than on every response.
+        self._encoded_headers = tuple(
+            (name.lower().encode(), value.encode())
+            for name, value in self.headers.items()
+        )
 
     async def __call__(self, scope, receive, send):
         """
@@ -267,11 +296,13 @@ class SecurityHeadersMiddleware(Middleware):
                 headers = list(message.get("headers", []))
 
                 # Only add headers if they don't already exist
-                existing_header_names = {name.decode().lower() for name, _ in headers}
+                existing_header_names = {name.lower() for name, _ in headers}
 
-                for header_name, header_value in self.headers.items():
-                    if header_name.lower() not in existing_header_names:
-                        headers.append([header_name.encode(), header_value.encode()])
+                headers.extend(
+                    header
+                    for header in self._encoded_headers
+                    if header[0] not in existing_header_names
+                )
 
                 message["headers"] = headers
 
@@ -1,13 +1,77 @@
 import asyncio
 import json
+import secrets
 from io import BytesIO
-from urllib.parse import parse_qs
+from urllib.parse import parse_qsl
 
 from werkzeug.formparser import parse_form_data
 
+try:
+    import orjson
+
+    # orjson parses bytes directly and is several times faster than the stdlib.
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 # Maximum request body size (10MB default, configurable)
 MAX_REQUEST_BODY_SIZE = 10 * 1024 * 1024  # 10 MB
 
+# Marks a not-yet-parsed JSON body; None is a valid parse result ("null").
+_MISSING = object()
+
+# Canonical method strings, so the common methods reuse one interned object
+# (with a cached hash) instead of a fresh .upper() copy per request.
+_METHOD_CANON = {
+    m: m for m in ("GET", "HEAD", "POST", "PUT", "DELETE", "PATCH", "OPTIONS")
+}
+_METHOD_CANON.update({m.lower(): m for m in list(_METHOD_CANON)})
+
+
+class Headers(dict):
+    """
+    A dictionary of request headers with case-insensitive keys.
+
+    Keys are stored lowercase; every lookup and mutation lower-cases the name
+    it is given. A repeated header keeps its first value, as `Request._header`
+    does.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, items=()):
+        super().__init__()
+        for key, value in items:
+            dict.setdefault(self, key.lower(), value)
+
+    def __getitem__(self, key):
+        return dict.__getitem__(self, key.lower())
+
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, key.lower(), value)
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key.lower())
+
+    def __contains__(self, key):
+        return dict.__contains__(self, key.lower()) if isinstance(key, str) else False
+
+    def get(self, key, default=None):
+        return dict.get(self, key.lower(), default)
+
+    def setdefault(self, key, default=None):
+        return dict.setdefault(self, key.lower(), default)
+
+    def pop(self, key, *default):
+        return dict.pop(self, key.lower(), *default)
+
+    def update(self, other=(), **kwargs):
+        items = other.items() if hasattr(other, "items") else other
+        for key, value in items:
+            self[key] = value
+        for key, value in kwargs.items():
+            self[key] = value
+
 
 class Request:
     """
@@ -24,29 +88,113 @@ class Request:
         method (str): The HTTP method (e.g., 'GET', 'POST').
         path (str): The request path.
         query (dict): A dictionary of query parameters.
-        headers (dict): A dictionary of request headers.
+        headers (Headers): A dictionary of request headers, looked up case-insensitively.
         cookies (dict): A dictionary of request cookies.
-        user: An attribute to hold user information, typically populated by authentication middleware.
+        user: The logged-in user, loaded through the application on first access.
     """
 
     def __init__(self, scope, receive, app):
         self.scope = scope
         self.receive = receive
         self.app = app
-        self.method = self.scope.get("method", "GET").upper()
-        self.path = self.scope.get("path", "/")
-        self.query = self._parse_query(self.scope.get("query_string", b"").decode())
-        self.headers = self._parse_headers(self.scope.get("headers", []))
-        self.content_type = self.headers.get("content-type", "")
-        self.cookies = self._parse_cookies(self.headers)
-        self.user = None
+        method = scope.get("method", "GET")
+        self.method = _METHOD_CANON.get(method) or method.upper()
+        self.path = scope.get("path", "/")
+        self._raw_headers = scope.get("headers", [])
+        self.content_type = self._header_str(b"content-type")
+        self._user = _MISSING
+        self._csrf_token = None
+        self.new_csrf_token_generated = False
+
+        self._query = None
+        self._headers = None
+        self._cookies = None
 
         self._body = None
         self._form = None
-        self._json = None
+        self._json = _MISSING
         self._files = None
         self._is_stream_consumed = False
 
+    @property
+    def query(self):
+        """A dictionary of query parameters, parsed on first access."""
+        if self._query is None:
+            query_string = self.scope.get("query_string", b"")
+            self._query = (
+                self._parse_query(query_string.decode()) if query_string else {}
+            )
+        return self._query
+
+    # Alias used in the documentation examples.
+    query_params = query
+
+    @property
+    def user(self):
+        """The logged-in user, or None; loaded only when a handler asks for it."""
+        if self._user is _MISSING:
+            load_user = getattr(self.app, "_load_request_user", None)
+            self._user = load_user(self) if load_user is not None else None
+        return self._user
+
+    @user.setter
+    def user(self, value):
+        self._user = value
+
+    @property
+    def csrf_token(self):
+        """
+        The CSRF token from the request cookie.
+
+        A new token is minted on first access when the request has none, and
+        `new_csrf_token_generated` is set so the response can store it.
+        """
+        if self._csrf_token is None:
+            token = self.cookies.get("csrf_token")
+            if not token:
+                token = secrets.token_urlsafe(32)
+                self.new_csrf_token_generated = True
+            self._csrf_token = token
+        return self._csrf_token
+
+    @csrf_token.setter
+    def csrf_token(self, value):
+        self._csrf_token = value
+
+    @property
+    def headers(self):
+        """The request headers, decoded on first access."""
+        if self._headers is None:
+            self._headers = self._parse_headers(self._raw_headers)
+        return self._headers
+
+    @property
+    def cookies(self):
+        """A dictionary of request cookies, parsed on first access."""
+        if self._cookies is None:
+            self._cookies = self._parse_cookies(self._header_str(b"cookie"))
+        return self._cookies
+
+    def _header(self, name):
+        """
+        Looks up a raw header without decoding the full header list.
+
+        Args:
+            name (bytes): The lowercase header name.
+
+        Returns:
+            bytes | None: The raw value of the first matching header, if any.
+        """
+        for key, value in self._raw_headers:
+            if key == name:
+                return value
+        return None
+
+    def _header_str(self, name):
+        """Returns a single header decoded to str, or an empty string if absent."""
+        value = self._header(name)
+        return value.decode("latin-1") if value is not None else ""
+
     async def stream(self):
         """
         Asynchronously yields chunks of the request body.
@@ -91,7 +239,8 @@ class Request:
                     "Request stream was already consumed via stream(). "
                     "Always use body() if you need to access the body multiple times."
                 )
-            chunks = []
+            first = b""
+            buffer = None
             total_size = 0
 
             async for chunk in self.stream():
@@ -104,9 +253,16 @@ class Request:
                         f"size of {MAX_REQUEST_BODY_SIZE} bytes"
                     )
 
-                chunks.append(chunk)
+                # Most bodies arrive in a single message and are kept as-is;
+                # later chunks are appended to one growing buffer.
+                if buffer is None and not first:
+                    first = chunk
+                elif chunk:
+                    if buffer is None:
+                        buffer = bytearray(first)
+                    buffer += chunk
 
-            self._body = b"".join(chunks)
+            self._body = bytes(buffer) if buffer is not None else bytes(first)
         return self._body
 
     async def json(self):
@@ -119,11 +275,11 @@ class Request:
         Returns:
             dict: The parsed JSON data.
         """
-        if self._json is None:
+        if self._json is _MISSING:
             if "application/json" in self.content_type:
                 try:
                     body_bytes = await self.body()
-                    self._json = json.loads(body_bytes) if body_bytes else {}
+                    self._json = _json_loads(body_bytes) if body_bytes else {}
                 except (json.JSONDecodeError, ValueError):
                     self._json = {}
             else:
@@ -141,13 +297,11 @@ class Request:
             dict: A dictionary of form fields.
         """
         if self._form is None:
-            content_type = self.headers.get("content-type", "")
+            content_type = self.content_type
             if self.method in ("POST", "PUT", "PATCH"):
                 if "application/x-www-form-urlencoded" in content_type:
                     body_bytes = await self.body()
-                    self._form = {
-                        k: v[0] for k, v in parse_qs(body_bytes.decode()).items()
-                    }
+                    self._form = self._parse_query(body_bytes.decode())
                 elif "multipart/form-data" in content_type:
                     await self._parse_multipart()
                 else:
@@ -164,7 +318,7 @@ class Request:
             dict: A dictionary of uploaded files, where values are `UploadedFile` instances.
         """
         if self._files is None:
-            content_type = self.headers.get("content-type", "")
+            content_type = self.content_type
             if (
                 self.method in ("POST", "PUT", "PATCH")
                 and "multipart/form-data" in content_type
@@ -175,16 +329,21 @@ class Request:
         return self._files
 
     def _parse_query(self, query_string):
-        """Parses a URL query string into a dictionary."""
-        return {k: v[0] for k, v in parse_qs(query_string).items()}
+        """Parses a URL query string into a dictionary, keeping each key's first value."""
+        query = {}
+        for key, value in parse_qsl(query_string):
+            query.setdefault(key, value)
+        return query
 
     def _parse_headers(self, raw_headers):
-        """Parses raw ASGI headers into a dictionary."""
-        return {k.decode(): v.decode() for k, v in raw_headers}
+        """Parses raw ASGI headers into a case-insensitive dictionary."""
+        # HTTP header bytes are latin-1 (as ASGI specifies), which never fails to decode.
+        return Headers(
+            (k.decode("latin-1"), v.decode("latin-1")) for k, v in raw_headers
+        )
 
-    def _parse_cookies(self, headers):
-        """Parses the 'cookie' header into a dictionary."""
-        cookie_string = headers.get("cookie", "")
+    def _parse_cookies(self, cookie_string):
+        """Parses the 'cookie' header value into a dictionary."""
         if not cookie_string:
             return {}
         cookies = {}
@@ -204,7 +363,7 @@ class Request:
         environ = {
             "wsgi.input": BytesIO(body_bytes),
             "CONTENT_LENGTH": str(len(body_bytes)),
-            "CONTENT_TYPE": self.headers.get("content-type"),
+            "CONTENT_TYPE": self.content_type,
         }
 
         loop = asyncio.get_running_loop()
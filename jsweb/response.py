@@ -9,6 +9,37 @@ from jinja2 import Environment, FileSystemLoader, TemplateNotFound, select_autoe
 
 logger = logging.getLogger(__name__)
 
+# One encoder shared by every response: compact separators, like orjson;
+# ensure_ascii kept so lone surrogates still encode. For pretty output, call
+# json.dumps directly and wrap the result in a Response.
+_json_encode = pyjson.JSONEncoder(separators=(",", ":")).encode
+
+try:
+    import orjson
+
+    def _json_dumps(data) -> bytes:
+        """Serializes data to JSON bytes, with orjson when it is installed."""
+        try:
+            # Non-str keys are stringified like the stdlib does, e.g. {1: "a"}.
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            # Cases orjson rejects but the stdlib handles, such as integers wider
+            # than 64 bits; anything unserializable still raises TypeError here.
+            return _json_encode(data).encode("utf-8")
+
+except ImportError:
+
+    def _json_dumps(data) -> bytes:
+        """Serializes data to JSON bytes, with orjson when it is installed."""
+        return _json_encode(data).encode("utf-8")
+
+
+try:
+    import msgpack as _msgpack
+except ImportError:
+    _msgpack = None
+
+
 _JSWEB_SCRIPT_CONTENT = ""
 try:
     script_path = os.path.join(os.path.dirname(__file__), "static", "jsweb.js")
@@ -92,6 +123,11 @@ HTTP_STATUS_CODES = {
 }
 
 
+def _allows_body(status_code: int) -> bool:
+    """Whether a response with this status may carry content headers (RFC 9110)."""
+    return status_code >= 200 and status_code not in (204, 304)
+
+
 class Response:
     """
     A base class for HTTP responses, encapsulating the body, status code, and headers.
@@ -115,14 +151,21 @@ class Response:
     ):
         self.body = body
         self.status_code = status_code
-        self.headers = headers or {}
         self._cookies = (
             []
         )  # Store cookies separately to support multiple Set-Cookie headers
 
         final_content_type = content_type or self.default_content_type
-        if "content-type" not in self.headers:
-            self.headers["content-type"] = final_content_type
+        if headers:
+            # Copy, so a headers dict shared between responses never picks up
+            # one response's content-length.
+            self.headers = dict(headers)
+            if "content-type" not in self.headers and _allows_body(status_code):
+                self.headers["content-type"] = final_content_type
+        elif _allows_body(status_code):
+            self.headers = {"content-type": final_content_type}
+        else:
+            self.headers = {}
 
     def set_cookie(
         self,
@@ -169,6 +212,18 @@ class Response:
         # Store cookies separately to properly support multiple Set-Cookie headers
         self._cookies.append(cookie_val)
 
+    def set_cookie_header(self, cookie_val: str):
+        """
+        Adds a pre-formatted `Set-Cookie` header value, such as `"name=value; Path=/"`.
+
+        Use this for cookies whose attributes never change, so they can be
+        formatted once instead of on every response.
+
+        Args:
+            cookie_val (str): The complete cookie string.
+        """
+        self._cookies.append(cookie_val)
+
     def delete_cookie(self, key: str, path: str = "/", domain: str = None):
         """
         Deletes a cookie by setting its expiration date to the past.
@@ -180,12 +235,28 @@ class Response:
         """
         self.set_cookie(key, expires=datetime(1970, 1, 1), path=path, domain=domain)
 
+    def _start_message(self) -> dict:
+        """Builds the ASGI `http.response.start` message from the status and headers."""
+        # Build headers list, properly handling multiple Set-Cookie headers
+        headers_list = [[k.encode(), v.encode()] for k, v in self.headers.items()]
+
+        # Add each cookie as a separate Set-Cookie header (proper HTTP specification)
+        for cookie in self._cookies:
+            headers_list.append([b"set-cookie", cookie.encode()])
+
+        return {
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": headers_list,
+        }
+
     async def __call__(self, scope, receive, send):
         """
         Sends the response to the ASGI server.
 
         This method encodes the body, sets the content-length header if not already
-        present, and sends the response via the ASGI `send` channel.
+        present, and sends the response via the ASGI `send` channel. Bodiless
+        statuses (1xx, 204, 304) get no computed content-length.
 
         Args:
             scope (dict): The ASGI connection scope.
@@ -195,23 +266,10 @@ class Response:
         body_bytes = (
             self.body if isinstance(self.body, bytes) else self.body.encode("utf-8")
         )
-        if "content-length" not in self.headers:
+        if "content-length" not in self.headers and _allows_body(self.status_code):
             self.headers["content-length"] = str(len(body_bytes))
 
-        # Build headers list, properly handling multiple Set-Cookie headers
-        headers_list = [[k.encode(), v.encode()] for k, v in self.headers.items()]
-
-        # Add each cookie as a separate Set-Cookie header (proper HTTP specification)
-        for cookie in self._cookies:
-            headers_list.append([b"set-cookie", cookie.encode()])
-
-        await send(
-            {
-                "type": "http.response.start",
-                "status": self.status_code,
-                "headers": headers_list,
-            }
-        )
+        await send(self._start_message())
         await send(
             {
                 "type": "http.response.body",
@@ -246,10 +304,15 @@ class HTMLResponse(Response):
             self.body if isinstance(self.body, str) else self.body.decode("utf-8")
         )
 
-        is_full_page = "</html>" in body_str.lower()
-        if is_full_page and _JSWEB_SCRIPT_CONTENT:
+        if _JSWEB_SCRIPT_CONTENT:
+            # Lower-case the body once; both checks below scan the same copy.
+            body_lower = body_str.lower()
+            is_full_page = "</html>" in body_lower
+        else:
+            is_full_page = False
+        if is_full_page:
             script_tag = f"<script>{_JSWEB_SCRIPT_CONTENT}</script>"
-            injection_point = body_str.lower().rfind("</head>")
+            injection_point = body_lower.rfind("</head>")
 
             if injection_point != -1:
                 body_str = (
@@ -260,6 +323,75 @@ class HTMLResponse(Response):
         await super().__call__(scope, receive, send)
 
 
+class FileResponse(Response):
+    """
+    A response that streams a file from disk instead of loading it into memory.
+
+    The file is sent in `chunk_size` pieces, or handed to the server in one
+    `http.response.pathsend` message when the server offers that ASGI extension
+    (which lets it use zero-copy `sendfile`).
+
+    Args:
+        path (str): The absolute path of the file to send.
+        status_code (int): The HTTP status code.
+        headers (dict, optional): A dictionary of response headers.
+        content_type (str, optional): The content type of the file.
+    """
+
+    default_content_type = "application/octet-stream"
+    chunk_size = 64 * 1024
+
+    def __init__(
+        self,
+        path: str,
+        status_code: int = 200,
+        headers: dict = None,
+        content_type: str = None,
+    ):
+        super().__init__(b"", status_code, headers, content_type)
+        self.path = path
+
+    async def __call__(self, scope, receive, send):
+        """
+        Streams the file to the ASGI server.
+
+        Args:
+            scope (dict): The ASGI connection scope.
+            receive (callable): The ASGI receive channel.
+            send (callable): The ASGI send channel.
+        """
+        try:
+            f = open(self.path, "rb")
+        except OSError:
+            error = Response(
+                b"500 Internal Server Error", status_code=500, content_type="text/html"
+            )
+            await error(scope, receive, send)
+            return
+
+        with f:
+            if "content-length" not in self.headers:
+                self.headers["content-length"] = str(os.fstat(f.fileno()).st_size)
+            await send(self._start_message())
+
+            if "http.response.pathsend" in scope.get("extensions", ()):
+                await send({"type": "http.response.pathsend", "path": self.path})
+                return
+
+            while True:
+                chunk = f.read(self.chunk_size)
+                more_body = len(chunk) == self.chunk_size
+                await send(
+                    {
+                        "type": "http.response.body",
+                        "body": chunk,
+                        "more_body": more_body,
+                    }
+                )
+                if not more_body:
+                    break
+
+
 class JSONResponse(Response):
     """
     A response class for JSON content.
@@ -280,8 +412,38 @@ class JSONResponse(Response):
         status_code: int = 200,
         headers: dict = None,
     ):
-        body = pyjson.dumps(data)
-        super().__init__(body, status_code, headers)
+        super().__init__(_json_dumps(data), status_code, headers)
+
+
+class MsgpackResponse(Response):
+    """
+    A response class for MessagePack content.
+
+    A compact binary alternative to `JSONResponse` for large or numeric payloads.
+    Requires the `msgpack` extra.
+
+    Args:
+        data (any): The Python data to be serialized to MessagePack.
+        status_code (int): The HTTP status code.
+        headers (dict, optional): A dictionary of response headers.
+
+    Raises:
+        RuntimeError: If `msgpack` is not installed.
+    """
+
+    default_content_type = "application/msgpack"
+
+    def __init__(
+        self,
+        data: any,
+        status_code: int = 200,
+        headers: dict = None,
+    ):
+        if _msgpack is None:
+            raise RuntimeError(
+                "MsgpackResponse requires msgpack. Install it with 'pip install jsweb[msgpack]'."
+            )
+        super().__init__(_msgpack.packb(data, use_bin_type=True), status_code, headers)
 
 
 class RedirectResponse(Response):
@@ -395,6 +557,44 @@ def json(data: any, status_code: int = 200, headers: dict = None) -> JSONRespons
     return JSONResponse(data, status_code=status_code, headers=headers)
 
 
+def msgpack(data: any, status_code: int = 200, headers: dict = None) -> MsgpackResponse:
+    """
+    A shortcut function to create a MsgpackResponse.
+
+    Args:
+        data (any): The Python data to be serialized to MessagePack.
+        status_code (int): The HTTP status code.
+        headers (dict, optional): A dictionary of response headers.
+
+    Returns:
+        MsgpackResponse: The MessagePack response object.
+    """
+    return MsgpackResponse(data, status_code=status_code, headers=headers)
+
+
+def negotiated(
+    req, data: any, status_code: int = 200, headers: dict = None
+) -> Response:
+    """
+    Serializes data in the format the client asked for in its Accept header.
+
+    Clients that accept `application/msgpack` get a MsgpackResponse when `msgpack`
+    is installed; everyone else gets a JSONResponse.
+
+    Args:
+        req (Request): The current request.
+        data (any): The Python data to be serialized.
+        status_code (int): The HTTP status code.
+        headers (dict, optional): A dictionary of response headers.
+
+    Returns:
+        Response: A MsgpackResponse or a JSONResponse.
+    """
+    if _msgpack is not None and "application/msgpack" in req.headers.get("accept", ""):
+        return MsgpackResponse(data, status_code=status_code, headers=headers)
+    return JSONResponse(data, status_code=status_code, headers=headers)
+
+
 def redirect(
     url: str, status_code: int = 302, headers: dict = None
 ) -> RedirectResponse:
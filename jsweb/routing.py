@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import asyncio
 import re
+import sys
 import uuid
 from collections.abc import Callable
+from types import MappingProxyType
 
 
 class NotFound(Exception):
@@ -31,21 +34,17 @@ def _int_converter(value: str) -> int | None:
     if len(value) > 15:
         return None
 
-    try:
-        if value.startswith("-") and value[1:].isdigit():
-            result = int(value)
-        elif value.isdigit():
-            result = int(value)
-        else:
-            return None
-
-        # Validate range to prevent overflow (32-bit signed integer range)
-        if abs(result) > 2147483647:  # 2^31 - 1
-            return None
+    # isdigit() also accepts non-ASCII digits that int() rejects; checking
+    # isascii() up front means int() below can never raise.
+    digits = value[1:] if value[:1] == "-" else value
+    if not (digits.isdigit() and digits.isascii()):
+        return None
 
+    result = int(value)
+    # Validate range to prevent overflow (32-bit signed integer range)
+    if -2147483647 <= result <= 2147483647:  # 2^31 - 1
         return result
-    except (ValueError, OverflowError):
-        return None
+    return None
 
 
 def _float_converter(value: str) -> float | None:
@@ -113,6 +112,10 @@ def _path_converter(value: str) -> str | None:
     return value
 
 
+# Matches a `<type:name>` parameter in a route path.
+_PARAM_PATTERN = re.compile(r"<(\w+):(\w+)>")
+
+
 class Route:
     """
     Represents a single route, mapping a URL path to a handler function.
@@ -124,6 +127,7 @@ class Route:
         path (str): The URL path pattern (e.g., '/users/<int:user_id>').
         handler (Callable): The view function to execute for this route.
         methods (List[str]): A list of allowed HTTP methods (e.g., ['GET', 'POST']).
+        allowed_methods (FrozenSet[str]): The same methods, for O(1) membership tests.
         endpoint (str): A unique name for the route, used for URL generation.
         is_static (bool): A flag indicating if the route has dynamic parameters.
     """
@@ -132,11 +136,14 @@ class Route:
         "path",
         "handler",
         "methods",
+        "allowed_methods",
         "endpoint",
         "converters",
         "is_static",
         "regex",
         "param_names",
+        "_params",
+        "_url_template",
     )
 
     TYPE_CONVERTERS = {
@@ -154,14 +161,26 @@ class Route:
         self.path = path
         self.handler = handler
         self.methods = methods
+        self.allowed_methods = frozenset(methods)
         self.endpoint = endpoint
         self.converters = {}
         self.is_static = "<" not in path
         if not self.is_static:
             self.regex, self.param_names = self._compile_path()
+            # (name, converter, group index) triples, so match() needs no lookups.
+            self._params = tuple(
+                (name, self.converters[name], self.regex.groupindex[name])
+                for name in self.param_names
+            )
+            # str.format template for url_for; literal braces in the path are escaped.
+            self._url_template = _PARAM_PATTERN.sub(
+                r"{\2}", path.replace("{", "{{").replace("}", "}}")
+            )
         else:
             self.regex = None
             self.param_names = []
+            self._params = ()
+            self._url_template = None
 
     def _compile_path(self):
         """
@@ -174,21 +193,27 @@ class Route:
             (re.Pattern, List[str]): A tuple containing the compiled regex and a
                                      list of parameter names.
         """
-        param_defs = re.findall(r"<(\w+):(\w+)>", self.path)
-        regex_path = "^" + self.path + "$"
         param_names = []
+        parts = []
+        pos = 0
 
-        for type_name, param_name in param_defs:
+        # One pass over the <type:name> tokens; the literal text between them is
+        # escaped so characters such as '.' only match themselves.
+        for m in _PARAM_PATTERN.finditer(self.path):
+            type_name, param_name = m.groups()
             converter, regex_part = self.TYPE_CONVERTERS.get(
                 type_name, self.TYPE_CONVERTERS["str"]
             )
-            regex_path = regex_path.replace(
-                f"<{type_name}:{param_name}>", f"(?P<{param_name}>{regex_part})"
-            )
+            parts.append(re.escape(self.path[pos : m.start()]))
+            parts.append(f"(?P<{param_name}>{regex_part})")
             self.converters[param_name] = converter
             param_names.append(param_name)
+            pos = m.end()
+        parts.append(re.escape(self.path[pos:]))
+        regex_path = "^" + "".join(parts) + "$"
 
-        return re.compile(regex_path), param_names
+        # Route patterns only ever need ASCII classes, which keeps \d to 0-9.
+        return re.compile(regex_path, re.ASCII), param_names
 
     def match(self, path: str) -> dict[str, any] | None:
         """
@@ -211,15 +236,96 @@ class Route:
         if not match:
             return None
 
-        params = match.groupdict()
+        group = match.group
         try:
-            for name, value in params.items():
-                params[name] = self.converters[name](value)
-            return params
+            return {
+                name: convert(group(index)) for name, convert, index in self._params
+            }
         except (ValueError, TypeError):
             return None
 
 
+# Maximum number of (path, method) pairs whose dynamic resolution is memoized.
+RESOLVE_CACHE_SIZE = 1024
+
+# Shared, read-only params for static routes, which never have any.
+_EMPTY_PARAMS = MappingProxyType({})
+
+
+class _TrieNode:
+    """
+    A node in the segment trie used to narrow down dynamic route candidates.
+
+    Literal segments are looked up in `children`; segments containing a
+    parameter share the single `wildcard` child. Routes whose remaining path
+    contains a `path` parameter may span any number of segments, so they are
+    kept on the node where that parameter starts, in `catchall`.
+    """
+
+    __slots__ = ("children", "wildcard", "routes", "catchall")
+
+    def __init__(self):
+        self.children: dict[str, _TrieNode] = {}
+        self.wildcard: _TrieNode | None = None
+        self.routes: list[tuple[int, Route]] = []
+        self.catchall: list[tuple[int, Route]] = []
+
+    def insert(self, route: Route, order: int):
+        """
+        Adds a dynamic route below this node.
+
+        Args:
+            route (Route): The route to add.
+            order (int): The route's registration index, used to keep first-match priority.
+        """
+        node = self
+        for segment in route.path.split("/"):
+            if "<path:" in segment:
+                node.catchall.append((order, route))
+                return
+            if "<" in segment:
+                if node.wildcard is None:
+                    node.wildcard = _TrieNode()
+                node = node.wildcard
+            else:
+                child = node.children.get(segment)
+                if child is None:
+                    # Routes share prefixes such as "api", so keep one copy of each key.
+                    # Request segments are never interned: they are client-controlled.
+                    child = node.children[sys.intern(segment)] = _TrieNode()
+                node = child
+        node.routes.append((order, route))
+
+    def candidates(self, segments: list[str]) -> list[tuple[int, Route]]:
+        """
+        Collects the routes whose segment structure fits the given path.
+
+        Candidates still have to be confirmed with `Route.match`.
+
+        Args:
+            segments (List[str]): The request path split on '/'.
+
+        Returns:
+            List[Tuple[int, Route]]: The candidate routes with their registration index.
+        """
+        found = []
+        depth = len(segments)
+        stack = [(self, 0)]
+        while stack:
+            node, i = stack.pop()
+            if node.catchall:
+                found.extend(node.catchall)
+            if i == depth:
+                found.extend(node.routes)
+                continue
+            if node.wildcard is not None:
+                stack.append((node.wildcard, i + 1))
+            child = node.children.get(segments[i])
+            if child is not None:
+                stack.append((child, i + 1))
+        return found
+
+
 class Router:
     """
     Manages a collection of routes and resolves incoming requests to the correct handler.
@@ -230,8 +336,13 @@ class Router:
 
     def __init__(self):
         self.static_routes: dict[str, Route] = {}
+        self._static_handlers: dict[tuple[str, str], Callable] = {}
         self.dynamic_routes: list[Route] = []
         self.endpoints: dict[str, Route] = {}
+        self._dynamic_trie = _TrieNode()
+        self._resolve_cache: dict[tuple[str, str], tuple[Callable, dict]] = {}
+        # Handlers that must be awaited, classified once at registration.
+        self.coroutine_handlers: set[Callable] = set()
 
     def add_route(
         self,
@@ -254,6 +365,10 @@ class Router:
         """
         if methods is None:
             methods = ["GET"]
+        else:
+            # Request.method is always upper-case, so normalize to match it;
+            # interning lets its canonical strings compare by identity.
+            methods = [sys.intern(m.upper()) for m in methods]
 
         if endpoint is None:
             endpoint = handler.__name__
@@ -262,12 +377,24 @@ class Router:
             raise ValueError(f'Endpoint "{endpoint}" is already registered.')
 
         route = Route(path, handler, methods, endpoint)
+        if asyncio.iscoroutinefunction(handler):
+            self.coroutine_handlers.add(handler)
 
         if route.is_static:
+            replaced = self.static_routes.get(path)
+            if replaced is not None:
+                for replaced_method in replaced.methods:
+                    self._static_handlers.pop((path, replaced_method), None)
             self.static_routes[path] = route
+            for route_method in methods:
+                self._static_handlers[(path, route_method)] = handler
         else:
+            self._dynamic_trie.insert(route, len(self.dynamic_routes))
             self.dynamic_routes.append(route)
 
+        # A new route can change how any previously seen path resolves.
+        self._resolve_cache.clear()
+
         self.endpoints[endpoint] = route
 
     def route(
@@ -303,7 +430,10 @@ class Router:
         """
         Finds the handler and parameters for a given path and HTTP method.
 
-        It prioritizes static routes for performance.
+        It prioritizes static routes for performance. Dynamic routes are narrowed
+        down with a segment trie, and the candidates are tried in registration
+        order so the first matching route still wins. Successful dynamic lookups
+        are memoized per (path, method) in a bounded cache.
 
         Args:
             path (str): The request path.
@@ -311,24 +441,64 @@ class Router:
 
         Returns:
             (Callable, Dict[str, any]): A tuple containing the matched handler and a
-                                         dictionary of URL parameters.
+                                         dictionary of URL parameters. Static routes
+                                         share a read-only empty mapping instead.
 
         Raises:
             NotFound: If no route matches the path.
             MethodNotAllowed: If a route matches but not for the given method.
         """
+        handler = self._static_handlers.get((path, method))
+        if handler is not None:
+            return handler, _EMPTY_PARAMS
         if path in self.static_routes:
-            route = self.static_routes[path]
-            if method in route.methods:
-                return route.handler, {}
             raise MethodNotAllowed(f"Method {method} not allowed for path {path}.")
 
-        for route in self.dynamic_routes:
-            if method not in route.methods:
+        key = (path, method)
+        cached = self._resolve_cache.get(key)
+        if cached is not None:
+            handler, params = cached
+            # Handlers may mutate their params, so never hand out the cached dict.
+            return handler, dict(params)
+
+        handler, params = self._resolve_dynamic(path, method)
+        if len(self._resolve_cache) >= RESOLVE_CACHE_SIZE:
+            # Evict the oldest entry; dicts keep insertion order.
+            self._resolve_cache.pop(next(iter(self._resolve_cache)), None)
+        self._resolve_cache[key] = (handler, params)
+        return handler, dict(params)
+
+    def _resolve_dynamic(self, path: str, method: str) -> (Callable, dict[str, any]):
+        """
+        Resolves a path against the dynamic routes, bypassing the cache.
+
+        Args:
+            path (str): The request path.
+            method (str): The HTTP request method.
+
+        Returns:
+            (Callable, Dict[str, any]): The matched handler and URL parameters.
+
+        Raises:
+            NotFound: If no dynamic route matches the path.
+            MethodNotAllowed: If a dynamic route matches the path but not the method.
+        """
+        candidates = self._dynamic_trie.candidates(path.split("/"))
+        if len(candidates) > 1:
+            # Registration indexes are unique, so Route objects are never compared.
+            candidates.sort()
+        other_methods = []
+        for _, route in candidates:
+            if method not in route.allowed_methods:
+                other_methods.append(route)
                 continue
             params = route.match(path)
             if params is not None:
                 return route.handler, params
+        # Only on failure: tell a 405 apart from a 404 without slowing down hits.
+        for route in other_methods:
+            if route.match(path) is not None:
+                raise MethodNotAllowed(f"Method {method} not allowed for path {path}.")
         raise NotFound(f"No route found for {path}")
 
     def url_for(self, endpoint: str, **params) -> str:
@@ -360,10 +530,4 @@ class Router:
                     f"Missing parameter '{param_name}' for endpoint '{endpoint}'."
                 )
 
-            for type_name in Route.TYPE_CONVERTERS.keys():
-                pattern = f"<{type_name}:{param_name}>"
-                if pattern in path:
-                    path = path.replace(pattern, str(params[param_name]))
-                    break
-
-        return path
+        return route._url_template.format_map(params)
@@ -4,10 +4,240 @@ for common tasks like password hashing and cache control.
 """
 
 import asyncio
+import hashlib
+import hmac
+import time
+from collections import OrderedDict
 from functools import wraps
 
 from werkzeug.security import check_password_hash, generate_password_hash
 
+try:
+    from argon2 import PasswordHasher
+    from argon2.exceptions import InvalidHashError, VerificationError
+except ImportError:
+    PasswordHasher = None
+
+# Argon2id passes over memory; raise it (PASSWORD_HASH_COST in the config) as
+# hardware gets faster. Memory and parallelism follow the OWASP recommendation.
+DEFAULT_PASSWORD_HASH_COST = 3
+_ARGON2_MEMORY_COST = 64 * 1024  # KiB
+_ARGON2_PARALLELISM = 4
+
+_password_hasher = None
+
+
+def init_password_hashing(time_cost: int = DEFAULT_PASSWORD_HASH_COST):
+    """
+    Configures the Argon2id cost used by `hash_password`.
+
+    This is called by the application at startup with the `PASSWORD_HASH_COST`
+    config value. It has no effect when `argon2-cffi` is not installed.
+
+    Args:
+        time_cost: The number of Argon2id passes over memory.
+    """
+    global _password_hasher
+    if PasswordHasher is not None:
+        _password_hasher = PasswordHasher(
+            time_cost=time_cost,
+            memory_cost=_ARGON2_MEMORY_COST,
+            parallelism=_ARGON2_PARALLELISM,
+        )
+
+
+def hash_password(password: str) -> str:
+    """
+    Hashes a password for storage.
+
+    Uses Argon2id when the `argon2` extra (`argon2-cffi`) is installed, and
+    falls back to Werkzeug's salted scrypt otherwise.
+
+    Args:
+        password: The plaintext password.
+
+    Returns:
+        str: The encoded hash, including its algorithm, parameters and salt.
+    """
+    if PasswordHasher is None:
+        return generate_password_hash(password, method="scrypt")
+    if _password_hasher is None:
+        init_password_hashing()
+    return _password_hasher.hash(password)
+
+
+def check_password(password: str, hashed: str) -> bool:
+    """
+    Verifies a password against a hash from `hash_password`.
+
+    Werkzeug hashes, such as those from `generate_password_hash`, are accepted
+    too, so stored hashes keep working when the algorithm changes.
+
+    Args:
+        password: The plaintext password to check.
+        hashed: The stored hash.
+
+    Returns:
+        bool: True if the password matches the hash.
+
+    Raises:
+        RuntimeError: If the hash is Argon2 but `argon2-cffi` is not installed.
+    """
+    if not hashed.startswith("$argon2"):
+        return check_password_hash(hashed, password)
+    if PasswordHasher is None:
+        raise RuntimeError(
+            "argon2-cffi is required to verify Argon2 password hashes. "
+            "Install it with: pip install jsweb[argon2]"
+        )
+    if _password_hasher is None:
+        init_password_hashing()
+    try:
+        return _password_hasher.verify(hashed, password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+
+def constant_time_compare(a, b) -> bool:
+    """
+    Compares two strings or byte strings in constant time.
+
+    Use this instead of `==` for secrets such as tokens and signatures, so the
+    comparison time does not reveal how many leading characters matched.
+
+    Args:
+        a (Union[str, bytes]): The first value.
+        b (Union[str, bytes]): The second value.
+
+    Returns:
+        bool: True if the values are equal.
+    """
+    if isinstance(a, str):
+        a = a.encode()
+    if isinstance(b, str):
+        b = b.encode()
+    return hmac.compare_digest(a, b)
+
+
+def sign_data(data, secret) -> str:
+    """
+    Computes a hex HMAC-SHA256 signature for the given data.
+
+    Args:
+        data (Union[str, bytes]): The data to sign.
+        secret (Union[str, bytes]): The signing key.
+
+    Returns:
+        str: The hex-encoded signature.
+    """
+    if isinstance(data, str):
+        data = data.encode()
+    if isinstance(secret, str):
+        secret = secret.encode()
+    return hmac.new(secret, data, hashlib.sha256).hexdigest()
+
+
+def verify_signature(data, signature, secret) -> bool:
+    """
+    Checks a signature produced by `sign_data`, in constant time.
+
+    Args:
+        data (Union[str, bytes]): The signed data.
+        signature (str): The hex signature to verify.
+        secret (Union[str, bytes]): The signing key.
+
+    Returns:
+        bool: True if the signature is valid for the data and key.
+    """
+    return constant_time_compare(sign_data(data, secret), signature)
+
+
+class RateLimiter:
+    """
+    Limits how often each key (a user, a client IP, ...) may make requests.
+
+    Uses a sliding window counter: each key keeps only its current and previous
+    fixed-window counts, and the previous count is weighted by how much of that
+    window still overlaps the sliding window. This closely approximates a full
+    request log while using O(1) time and memory per key.
+
+    Args:
+        max_requests (int): The number of requests allowed per window.
+        window_seconds (float): The length of the window in seconds.
+        max_keys (int): How many keys to track; the least recently seen are dropped.
+        clock (callable): Returns the current time in seconds.
+    """
+
+    def __init__(
+        self,
+        max_requests: int,
+        window_seconds: float,
+        max_keys: int = 100_000,
+        clock=time.monotonic,
+    ):
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+        self.max_keys = max_keys
+        self.clock = clock
+        # key -> [window number, current count, previous count, denied until],
+        # least recently seen first
+        self._windows = OrderedDict()
+
+    def allow_request(self, key) -> bool:
+        """
+        Records a request for `key` if it is within the limit.
+
+        Args:
+            key: Identifies who is making the request.
+
+        Returns:
+            bool: True if the request is allowed, False if it is rate limited.
+        """
+        now = self.clock()
+
+        state = self._windows.get(key)
+        if state is not None:
+            self._windows.move_to_end(key)
+            # Rejected requests change nothing, so a known rejection still holds.
+            if now < state[3]:
+                return False
+
+        window, elapsed = divmod(now, self.window_seconds)
+        if state is None:
+            state = self._windows[key] = [window, 0, 0, 0.0]
+            if len(self._windows) > self.max_keys:
+                self._windows.popitem(last=False)
+        elif window != state[0]:
+            # The previous window only counts if it is the one just before.
+            state[2] = state[1] if window == state[0] + 1 else 0
+            state[0], state[1] = window, 0
+
+        overlap = 1 - elapsed / self.window_seconds
+        if state[2] * overlap + state[1] >= self.max_requests:
+            state[3] = self._denied_until(state)
+            return False
+        state[1] += 1
+        return True
+
+    def _denied_until(self, state) -> float:
+        """
+        Computes the earliest time a rejected key could be allowed again.
+
+        The weighted count only falls as time passes, so until then every request
+        is rejected without recomputing it. The result is a lower bound: at that
+        time the full check runs again.
+        """
+        window_start = state[0] * self.window_seconds
+        current, previous = state[1], state[2]
+        if current >= self.max_requests:
+            # Wait for the next window, where this one's count fades out.
+            window_start += self.window_seconds
+            previous, current = current, 0
+        if not previous:
+            return window_start
+        remaining = (self.max_requests - current) / previous
+        return window_start + self.window_seconds * (1 - remaining)
+
 
 def never_cache(view):
     """
@@ -26,12 +256,14 @@ def never_cache(view):
         callable: The wrapped view function.
     """
 
+    is_coroutine = asyncio.iscoroutinefunction(view)
+
     @wraps(view)
     async def wrapper(req, *args, **kwargs):
         """
         Executes the view, then modifies the response headers to prevent caching.
         """
-        if asyncio.iscoroutinefunction(view):
+        if is_coroutine:
             response = await view(req, *args, **kwargs)
         else:
             response = view(req, *args, **kwargs)
@@ -47,4 +279,15 @@ def never_cache(view):
     return wrapper
 
 
-__all__ = ["generate_password_hash", "check_password_hash", "never_cache"]
+__all__ = [
+    "generate_password_hash",
+    "check_password_hash",
+    "hash_password",
+    "check_password",
+    "init_password_hashing",
+    "constant_time_compare",
+    "sign_data",
+    "verify_signature",
+    "RateLimiter",
+    "never_cache",
+]
@@ -2,13 +2,33 @@
 This module provides functionality for serving static files from the filesystem.
 """
 
+from __future__ import annotations
+
+import functools
 import mimetypes
 import os
+import stat
+
+from .response import FileResponse, Response
+
+# Error bodies are encoded once. Each miss still gets its own Response, since
+# responses are mutable; plain Response also skips HTMLResponse's script check.
+_FORBIDDEN_BODY = b"403 Forbidden"
+_NOT_FOUND_BODY = b"404 Not Found"
+
 
-from .response import HTMLResponse, Response
+@functools.lru_cache(maxsize=256)
+def _content_type_for(extension: str) -> str:
+    """Returns the content type for a lower-cased file extension such as '.css'."""
+    return mimetypes.guess_type("file" + extension)[0] or "application/octet-stream"
 
 
-def serve_static(request_path: str, static_url: str, static_dir: str) -> Response:
+def serve_static(
+    request_path: str,
+    static_url: str,
+    static_dir: str,
+    if_none_match: str | None = None,
+) -> Response:
     """
     Serves a static file from a directory with security checks.
 
@@ -19,32 +39,55 @@ def serve_static(request_path: str, static_url: str, static_dir: str) -> Respons
     Args:
         request_path (str): The full request path (e.g., '/static/css/style.css').
         static_url (str): The URL prefix for static files (e.g., '/static').
-        static_dir (str): The local directory where static files are stored.
+        static_dir (str): The local directory where static files are stored. Pass
+            an absolute path; a relative one is resolved against the current
+            working directory on every call.
+        if_none_match (str, optional): The request's `If-None-Match` header.
 
     Returns:
-        A Response object containing the file content if found and accessible,
-        or an appropriate HTTP error response (403, 404, 500).
+        A FileResponse that streams the file if found, a 304 response if the
+        client's cached copy is current, or an appropriate HTTP error response
+        (403, 404). A file that cannot be opened is answered
+        with a 500 when the response is sent.
     """
-    if not request_path.startswith(static_url):
-        return HTMLResponse("404 Not Found", status_code=404)
+    # Match whole segments: '/static' must not serve '/staticfoo/x'.
+    prefix = static_url.rstrip("/") + "/"
+    if not request_path.startswith(prefix):
+        return Response(_NOT_FOUND_BODY, status_code=404, content_type="text/html")
 
-    relative_path = request_path[len(static_url) :].lstrip("/")
+    relative_path = request_path[len(prefix) :].lstrip("/")
 
+    # Free for the absolute paths StaticFilesMiddleware passes: no getcwd() call.
     base_dir = os.path.abspath(static_dir)
     full_path = os.path.normpath(os.path.join(base_dir, relative_path))
 
-    if not full_path.startswith(base_dir):
-        return HTMLResponse("403 Forbidden", status_code=403)
-
-    if not os.path.isfile(full_path):
-        return HTMLResponse("404 Not Found", status_code=404)
+    # A plain prefix check would let '/srv/static' accept '/srv/static-private'.
+    try:
+        inside = os.path.commonpath((base_dir, full_path)) == base_dir
+    except ValueError:  # Different drives on Windows.
+        inside = False
+    if not inside:
+        return Response(_FORBIDDEN_BODY, status_code=403, content_type="text/html")
 
     try:
-        with open(full_path, "rb") as f:
-            content = f.read()
+        st = os.stat(full_path)
     except OSError:
-        return HTMLResponse("500 Internal Server Error", status_code=500)
+        st = None
+    if st is None or not stat.S_ISREG(st.st_mode):
+        return Response(_NOT_FOUND_BODY, status_code=404, content_type="text/html")
+
+    content_type = _content_type_for(os.path.splitext(full_path)[1].lower())
+    # Clients must revalidate, which costs a 304 with no disk read when unchanged.
+    headers = {
+        "etag": f'W/"{st.st_mtime_ns:x}-{st.st_size:x}"',
+        "cache-control": "no-cache",
+    }
 
-    content_type = mimetypes.guess_type(full_path)[0] or "application/octet-stream"
+    if if_none_match and (
+        if_none_match.strip() == "*"
+        or headers["etag"] in (tag.strip() for tag in if_none_match.split(","))
+    ):
+        # No content-type or length: a 304 must not describe a 0-byte asset.
+        return Response(b"", status_code=304, headers=headers)
 
-    return Response(content, status_code=200, content_type=content_type)
+    return FileResponse(full_path, headers=headers, content_type=content_type)
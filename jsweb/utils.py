@@ -1,6 +1,8 @@
+import functools
 import socket
 
 
+@functools.lru_cache(maxsize=1)
 def get_local_ip():
     """
     Attempts to determine the local IP address of the machine.
@@ -10,18 +12,15 @@ def get_local_ip():
     This is useful for displaying a network-accessible URL for the server.
 
     If the IP address cannot be determined (e.g., no network connection),
-    it defaults to '127.0.0.1'.
+    it defaults to '127.0.0.1'. The result is cached for the life of the process.
 
     Returns:
         str: The local IP address as a string.
     """
-    s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
     try:
-        # Doesn't actually send data, just connects to find the best interface
-        s.connect(("10.255.255.255", 1))
-        ip = s.getsockname()[0]
-    except Exception:
-        ip = "127.0.0.1"
-    finally:
-        s.close()
-    return ip
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            # Doesn't actually send data, just connects to find the best interface
+            s.connect(("10.255.255.255", 1))
+            return s.getsockname()[0]
+    except OSError:
+        return "127.0.0.1"
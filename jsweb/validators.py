@@ -7,6 +7,12 @@ field's data does not meet the required criteria.
 
 import re
 
+try:
+    from email_validator import EmailNotValidError, validate_email
+except ImportError:
+    # Without the optional dependency Email falls back to its regex alone.
+    validate_email = None
+
 
 class ValidationError(Exception):
     """Raised when a validator fails to validate its input."""
@@ -23,6 +29,8 @@ class DataRequired:
         message (str, optional): The error message to raise if validation fails.
     """
 
+    __slots__ = ("message",)
+
     def __init__(self, message="This field is required."):
         self.message = message
 
@@ -41,22 +49,69 @@ class Email:
     """
     Checks that the field's data is a valid email address.
 
+    A cheap regex rejects obviously malformed input first. When the optional
+    `email-validator` package is installed, the address is then checked
+    against the RFC syntax rules, including internationalized domains.
+
     Args:
         message (str, optional): The error message to raise if validation fails.
     """
 
+    __slots__ = ("message",)
+
+    regex = re.compile(r"^[^\s@]+@[^\s@]+\.[^\s@]+$")
+    _match = regex.match
+
     def __init__(self, message="Invalid email address."):
         self.message = message
-        self.regex = re.compile(r"^[^\s@]+@[^\s@]+\.[^\s@]+$")
 
     def __call__(self, form, field):
         """
-        Performs the validation using a regular expression.
+        Performs the validation.
+
+        Raises:
+            ValidationError: If the field data is not a valid email address.
+        """
+        value = field.data or ""
+        if self._match(value) is None:
+            raise ValidationError(self.message)
+        if validate_email is not None:
+            try:
+                validate_email(value, check_deliverability=False)
+            except EmailNotValidError as err:
+                raise ValidationError(self.message) from err
+
+
+class Regexp:
+    """
+    Checks that the field's data matches a regular expression.
+
+    The pattern is compiled once when the validator is created, and matching
+    is anchored at the start of the value as with `re.match`.
+
+    Args:
+        regex (str | re.Pattern): The pattern to match against.
+        flags (int, optional): Flags passed to `re.compile` for string patterns.
+        message (str, optional): The error message to raise if validation fails.
+    """
+
+    __slots__ = ("regex", "_match", "message")
+
+    def __init__(self, regex, flags=0, message="Invalid input."):
+        if isinstance(regex, str):
+            regex = re.compile(regex, flags)
+        self.regex = regex
+        self._match = regex.match
+        self.message = message
+
+    def __call__(self, form, field):
+        """
+        Performs the validation.
 
         Raises:
-            ValidationError: If the field data does not match the email regex.
+            ValidationError: If the field data does not match the pattern.
         """
-        if not self.regex.match(field.data):
+        if self._match(field.data or "") is None:
             raise ValidationError(self.message)
 
 
@@ -70,6 +125,8 @@ class Length:
         message (str, optional): The error message to raise if validation fails.
     """
 
+    __slots__ = ("min", "max", "message")
+
     def __init__(self, min=-1, max=-1, message=None):
         self.min = min
         self.max = max
@@ -97,6 +154,53 @@ class Length:
             raise ValidationError(message)
 
 
+class NumberRange:
+    """
+    Checks that a numeric field's data lies within an inclusive range.
+
+    Args:
+        min (int | float, optional): The minimum allowed value.
+        max (int | float, optional): The maximum allowed value.
+        message (str, optional): The error message to raise if validation fails.
+    """
+
+    __slots__ = ("min", "max", "message", "_lo", "_hi")
+
+    def __init__(self, min=None, max=None, message=None):
+        self.min = min
+        self.max = max
+        self.message = message
+        # Open bounds become infinities so __call__ is a single chained comparison.
+        self._lo = float("-inf") if min is None else min
+        self._hi = float("inf") if max is None else max
+
+    def __call__(self, form, field):
+        """
+        Performs the validation.
+
+        Raises:
+            ValidationError: If the data is missing, not a number, or outside
+                the min/max range.
+        """
+        value = field.data
+        try:
+            in_range = value is not None and self._lo <= value <= self._hi
+        except TypeError:  # Non-numeric data such as an unconverted '5'.
+            in_range = False
+        if not in_range:
+            if self.message:
+                message = self.message
+            elif self.min is None and self.max is None:
+                message = "Number is required."
+            elif self.max is None:
+                message = f"Number must be at least {self.min}."
+            elif self.min is None:
+                message = f"Number must be at most {self.max}."
+            else:
+                message = f"Number must be between {self.min} and {self.max}."
+            raise ValidationError(message)
+
+
 class EqualTo:
     """
     Compares the value of the field to the value of another field in the form.
@@ -106,6 +210,8 @@ class EqualTo:
         message (str, optional): The error message to raise if validation fails.
     """
 
+    __slots__ = ("fieldname", "message")
+
     def __init__(self, fieldname, message=None):
         self.fieldname = fieldname
         self.message = message
@@ -136,6 +242,8 @@ class FileRequired:
         message (str, optional): The error message to raise if validation fails.
     """
 
+    __slots__ = ("message",)
+
     def __init__(self, message="File is required."):
         self.message = message
 
@@ -150,6 +258,11 @@ class FileRequired:
             raise ValidationError(self.message)
 
 
+# Equal extension allowlists share one frozenset across every FileAllowed.
+# Allowlists are declared on form classes, so this only grows at import time.
+_ALLOWLIST_CACHE = {}
+
+
 class FileAllowed:
     """
     Validates that an uploaded file has an allowed extension.
@@ -159,8 +272,14 @@ class FileAllowed:
         message (str, optional): The error message to raise if validation fails.
     """
 
+    __slots__ = ("allowed_extensions", "_allowed", "message")
+
     def __init__(self, allowed_extensions, message=None):
-        self.allowed_extensions = [ext.lower() for ext in allowed_extensions]
+        self.allowed_extensions = [
+            ext.lower().lstrip(".") for ext in allowed_extensions
+        ]
+        allowed = frozenset(self.allowed_extensions)
+        self._allowed = _ALLOWLIST_CACHE.setdefault(allowed, allowed)
         self.message = message
 
     def __call__(self, form, field):
@@ -177,12 +296,10 @@ class FileAllowed:
         if not filename:
             raise ValidationError("Invalid file data.")
 
-        if "." not in filename:
-            ext = ""
-        else:
-            ext = filename.rsplit(".", 1)[1].lower()
+        _, dot, ext = filename.rpartition(".")
+        ext = ext.lower() if dot else ""
 
-        if ext not in self.allowed_extensions:
+        if ext not in self._allowed:
             message = self.message
             if message is None:
                 message = f"File type not allowed. Allowed types: {', '.join(self.allowed_extensions)}"
@@ -199,6 +316,8 @@ class FileSize:
         message (str, optional): The error message to raise if validation fails.
     """
 
+    __slots__ = ("max_size", "min_size", "message")
+
     def __init__(self, max_size=None, min_size=None, message=None):
         self.max_size = max_size
         self.min_size = min_size